@@ -0,0 +1,51 @@
+"""
+Show the tradeoff between CPU time and bytes saved for CompressionMiddleware
+on JSON bodies of different sizes, for each gzip level and brotli quality.
+
+    python benchmarks/compression.py
+"""
+import argparse
+import timeit
+
+from seastar import json
+from seastar.middleware.compression import brotli, gzip_compress
+
+
+def make_body(rows: int) -> bytes:
+    payload = [
+        {"id": i, "name": f"user-{i}", "email": f"user-{i}@example.com", "score": i / 3}
+        for i in range(rows)
+    ]
+    return json.dumps(payload).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    codecs = [(f"gzip-{level}", level) for level in (1, 6, 9)]
+    if brotli is not None:
+        codecs += [(f"br-{quality}", quality) for quality in (1, 4, 11)]
+    else:
+        print("brotli is not installed, skipped")
+
+    for rows in args.rows:
+        data = make_body(rows)
+        print(f"\n{rows} rows, {len(data):,} bytes")
+        for name, level in codecs:
+            if name.startswith("gzip"):
+                func = lambda: gzip_compress(data, level)  # noqa: E731
+            else:
+                func = lambda: brotli.compress(data, quality=level)  # noqa: E731
+
+            seconds = min(timeit.repeat(func, number=args.number, repeat=3))
+            ms = seconds / args.number * 1000
+            size = len(func())
+            saved = 1 - size / len(data)
+            print(f"  {name:<8} {ms:8.3f}ms  {size:>10,} bytes  {saved:6.1%} saved")
+
+
+if __name__ == "__main__":
+    main()
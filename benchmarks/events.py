@@ -0,0 +1,74 @@
+"""
+Generators for realistic Digital Ocean web events.
+"""
+from base64 import b64encode
+import json
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+
+BROWSER_HEADERS = {
+    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "accept-encoding": "gzip, deflate, br",
+    "accept-language": "en-US,en;q=0.5",
+    "cookie": "session=abc123; theme=dark; _ga=GA1.2.1234567890.1234567890",
+    "host": "faas-nyc1-2ef2e6cc.doserverless.co",
+    "user-agent": "Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Firefox/118.0",
+    "x-forwarded-for": "203.0.113.10",
+    "x-forwarded-proto": "https",
+    "x-request-id": "5d41402abc4b2a76b9719d911017c592",
+}
+
+
+def make_headers(count: int) -> dict[str, str]:
+    headers = dict(list(BROWSER_HEADERS.items())[:count])
+    for i in range(len(headers), count):
+        headers[f"x-custom-header-{i}"] = f"value-{i}" * 4
+    return headers
+
+
+def make_query_string(count: int) -> str:
+    return urlencode([(f"param{i}", f"value{i}") for i in range(count)])
+
+
+def make_payload(rows: int) -> list[dict[str, Any]]:
+    return [
+        {"id": i, "name": f"item-{i}", "price": i * 1.25, "tags": ["a", "b"]}
+        for i in range(rows)
+    ]
+
+
+def make_event(
+    method: str = "GET",
+    path: str = "/items/42",
+    header_count: int = 10,
+    query_params: int = 5,
+    payload_rows: Optional[int] = None,
+    base64_body: bool = False,
+) -> dict[str, Any]:
+    headers = make_headers(header_count)
+    http: dict[str, Any] = {
+        "method": method,
+        "path": path,
+        "headers": headers,
+        "queryString": make_query_string(query_params),
+    }
+
+    if payload_rows is not None:
+        body = json.dumps(make_payload(payload_rows))
+        headers["content-type"] = "application/json"
+        if base64_body:
+            http["body"] = b64encode(body.encode()).decode()
+            http["isBase64Encoded"] = True
+        else:
+            http["body"] = body
+            http["isBase64Encoded"] = False
+
+    return {"http": http}
+
+
+def copy_event(event: dict[str, Any]) -> dict[str, Any]:
+    """
+    Routes and middleware write to the event, so each call needs a new one.
+    """
+    return {**event, "http": {**event["http"]}}
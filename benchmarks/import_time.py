@@ -0,0 +1,119 @@
+"""
+Measure the cold start import cost of seastar with `python -X importtime`.
+
+Every sample runs in a fresh interpreter so nothing is shared between samples.
+The script exits with a non-zero status when the median cumulative import time
+of the module exceeds the budget, which makes it usable as a regression check.
+
+    python benchmarks/import_time.py --budget-ms 150
+
+The budget can also be relative to a baseline stored with --save-baseline. The
+import of a stdlib reference module is measured with it, and the baseline is
+scaled by how much slower or faster the reference is on this machine.
+
+    python benchmarks/import_time.py --save-baseline benchmarks/import_time.json
+    python benchmarks/import_time.py --baseline benchmarks/import_time.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+def sample(module: str) -> dict[str, tuple[int, int]]:
+    """
+    Import the module in a new interpreter and return a mapping of
+    module name -> (self time, cumulative time) in microseconds.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def median_ms(module: str, runs: int) -> float:
+    return statistics.median(sample(module)[module][1] / 1000 for _ in range(runs))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--module", default="seastar")
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--reference", default="asyncio")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--save-baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    samples = [sample(args.module) for _ in range(args.runs)]
+    totals = [s[args.module][1] / 1000 for s in samples]
+    median = statistics.median(totals)
+
+    cumulative: dict[str, list[int]] = {}
+    for s in samples:
+        for name, (_, cumulative_us) in s.items():
+            cumulative.setdefault(name, []).append(cumulative_us)
+
+    print(f"import {args.module}: median {median:.1f}ms over {args.runs} runs")
+    print(f"  min {min(totals):.1f}ms, max {max(totals):.1f}ms")
+    print("slowest imports (median cumulative):")
+    slowest = sorted(
+        ((statistics.median(v) / 1000, k) for k, v in cumulative.items()),
+        reverse=True,
+    )
+    for ms, name in slowest[1 : args.top + 1]:
+        print(f"  {ms:8.1f}ms  {name}")
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"FAIL: {median:.1f}ms exceeds the budget of {args.budget_ms}ms")
+        return 1
+
+    if args.baseline is None and args.save_baseline is None:
+        return 0
+
+    reference = median_ms(args.reference, args.runs)
+    print(f"import {args.reference}: median {reference:.1f}ms (reference)")
+
+    if args.save_baseline is not None:
+        with open(args.save_baseline, "w") as f:
+            baseline = {
+                "module": args.module,
+                "median_ms": round(median, 1),
+                "reference": args.reference,
+                "reference_ms": round(reference, 1),
+            }
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if (baseline["module"], baseline["reference"]) != (args.module, args.reference):
+        print(f"FAIL: {args.baseline} is not a baseline of {args.module}")
+        return 1
+
+    scale = reference / baseline["reference_ms"]
+    budget = baseline["median_ms"] * scale * (1 + args.tolerance)
+    print(f"budget {budget:.1f}ms: baseline {baseline['median_ms']}ms x {scale:.2f}")
+    if median > budget:
+        print(f"FAIL: {median:.1f}ms exceeds the budget of {budget:.1f}ms")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
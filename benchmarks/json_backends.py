@@ -0,0 +1,92 @@
+"""
+Compare encode/decode throughput of the available JSON backends on a large
+payload similar to what JSONResponse renders and Request.json() parses.
+
+    python benchmarks/json_backends.py --rows 10000
+"""
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+import timeit
+from uuid import UUID
+
+from seastar.json import BACKENDS, OrjsonBackend
+
+
+class Status(Enum):
+    ACTIVE = "active"
+    INACTIVE = "inactive"
+
+
+@dataclass
+class Address:
+    street: str
+    city: str
+    postal_code: str
+
+
+def make_payload(rows: int, extra_types: bool, nulls: bool = False) -> list[dict]:
+    start = datetime(2023, 1, 1)
+    payload = []
+    for i in range(rows):
+        row = {
+            "id": i,
+            "name": f"user-{i}",
+            "email": f"user-{i}@example.com",
+            "score": i * 0.5,
+            "tags": ["a", "b", "ç"],
+            "active": i % 2 == 0,
+            "address": {"street": "1 Main St", "city": "Köln", "postal_code": "5"},
+        }
+        if nulls:
+            row["deleted_at"] = None
+        if extra_types:
+            row["uuid"] = UUID(int=i)
+            row["created_at"] = start + timedelta(seconds=i)
+            row["status"] = Status.ACTIVE if i % 2 else Status.INACTIVE
+            row["address"] = Address("1 Main St", "Köln", "5")
+        payload.append(row)
+    return payload
+
+
+def bench(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    backends = []
+    for name, cls in BACKENDS.items():
+        try:
+            backends.append((name, cls()))
+        except ImportError:
+            print(f"{name}: not installed, skipped")
+    if "orjson" in dict(backends):
+        # without searching payloads that have a null for NaN and Infinity.
+        backends.append(("orjson no strict", OrjsonBackend(strict_nan=False)))
+
+    for extra_types, nulls in ((False, False), (True, False), (False, True)):
+        payload = make_payload(args.rows, extra_types, nulls)
+        text = BACKENDS["json"]().dumps(payload)
+        size_mb = len(text.encode()) / 1_000_000
+        label = "with extra types" if extra_types else "native types"
+        if nulls:
+            label += " and a null per row"
+        print(f"\n{args.rows} rows, {label}, {size_mb:.2f}MB")
+
+        for name, backend in backends:
+            encode = bench(lambda: backend.dumps(payload), args.number)
+            line = f"  {name:<18} encode {size_mb / encode:8.1f}MB/s"
+            if not extra_types and not nulls:
+                decode = bench(lambda: backend.loads(text), args.number)
+                line += f"  decode {size_mb / decode:8.1f}MB/s"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compare the type-dispatch JsonEncoder against the previous isinstance chain
+that used dataclasses.asdict(), on responses made of many dataclass rows.
+
+    python benchmarks/json_encoder.py --rows 5000
+"""
+import argparse
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime, date, time, timedelta
+from enum import Enum
+import inspect
+import json
+import timeit
+from typing import Any
+from uuid import UUID
+
+from seastar.json import JsonEncoder
+
+
+class LegacyJsonEncoder(json.JSONEncoder):
+    def default(self, o: Any) -> Any:
+        if not inspect.isclass(o) and is_dataclass(o):
+            return asdict(o)
+
+        elif isinstance(o, (datetime, date, time)):
+            return o.isoformat()
+
+        elif isinstance(o, Enum):
+            return o.value
+
+        elif isinstance(o, UUID):
+            return str(o)
+
+
+class Status(Enum):
+    ACTIVE = "active"
+    INACTIVE = "inactive"
+
+
+@dataclass
+class Address:
+    street: str
+    city: str
+
+
+@dataclass
+class User:
+    id: int
+    uuid: UUID
+    name: str
+    status: Status
+    created_at: datetime
+    address: Address
+    tags: list[str]
+
+
+def make_rows(count: int) -> list[User]:
+    start = datetime(2023, 1, 1)
+    return [
+        User(
+            id=i,
+            uuid=UUID(int=i),
+            name=f"user-{i}",
+            status=Status.ACTIVE,
+            created_at=start + timedelta(seconds=i),
+            address=Address("1 Main St", "Springfield"),
+            tags=["a", "b"],
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    assert json.dumps(rows, cls=JsonEncoder) == json.dumps(rows, cls=LegacyJsonEncoder)
+
+    results = {}
+    for name, cls in (("legacy", LegacyJsonEncoder), ("dispatch", JsonEncoder)):
+        timer = timeit.Timer(lambda: json.dumps(rows, cls=cls))
+        results[name] = min(timer.repeat(repeat=5, number=args.number)) / args.number
+        print(f"{name:<10} {results[name] * 1000:8.2f}ms for {args.rows} rows")
+
+    print(f"speedup    {results['legacy'] / results['dispatch']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
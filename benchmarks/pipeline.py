@@ -0,0 +1,360 @@
+"""
+Measure each stage of the request pipeline in isolation and end to end.
+
+Results can be written as JSON and compared against a stored baseline, the
+comparison fails when a benchmark is slower than the baseline by more than
+the threshold.
+
+    python -m benchmarks.pipeline --save benchmarks/baseline.json
+    python -m benchmarks.pipeline --compare benchmarks/baseline.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from typing import Any, Callable
+
+from starlette.exceptions import HTTPException
+
+from seastar import web_function
+from seastar.applications import Seastar
+from seastar.middleware.batch import BatchMiddleware
+from seastar.middleware import Middleware
+from seastar.middleware.cors import CORSMiddleware
+from seastar.middleware.errors import ServerErrorMiddleware
+from seastar.middleware.exceptions import ExceptionMiddleware
+from seastar.middleware.lifespan import LifespanMiddleware
+from seastar.requests import Request
+from seastar.responses import JSONResponse, PlainTextResponse
+from seastar.routing import Route, request_response
+
+from benchmarks.events import copy_event, make_event, make_payload
+
+
+BENCHMARKS: dict[str, Callable[[], Any]] = {}
+
+
+def benchmark(name: str) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+    def decorator(func: Callable[[], Any]) -> Callable[[], Any]:
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+def hello(request: Request) -> PlainTextResponse:
+    return PlainTextResponse("Hello, world!")
+
+
+def echo_json(request: Request) -> JSONResponse:
+    return JSONResponse(request.json())
+
+
+def manual_params(request: Request) -> PlainTextResponse:
+    item_id = request.path_params["item_id"]
+    param1 = request.query_params.get("param1", "")
+    return PlainTextResponse(f"{item_id} {param1}")
+
+
+def injected_params(item_id: int, param1: str = "") -> PlainTextResponse:
+    return PlainTextResponse(f"{item_id} {param1}")
+
+
+def not_found(request: Request) -> PlainTextResponse:
+    raise HTTPException(404)
+
+
+GET_EVENT = make_event(header_count=10, query_params=5)
+MANY_HEADERS_EVENT = make_event(header_count=50, query_params=50)
+LONG_QUERY_EVENT = make_event(header_count=60, query_params=200)
+JSON_EVENT = make_event("POST", payload_rows=100)
+BASE64_EVENT = make_event("POST", payload_rows=100, base64_body=True)
+LARGE_JSON_EVENT = make_event("POST", payload_rows=5000)
+
+ROUTE = Route("/items/{item_id:int}", hello)
+APP = request_response(hello)
+NOT_FOUND_APP = request_response(not_found)
+EXCEPTION_APP = ExceptionMiddleware(APP)
+NOT_FOUND_EXCEPTION_APP = ExceptionMiddleware(NOT_FOUND_APP)
+SERVER_ERROR_APP = ServerErrorMiddleware(APP)
+GET_FUNCTION = web_function("/items/{item_id:int}")(hello)
+NOT_FOUND_ROUTE = Route("/items/{item_id:int}", not_found)
+# The stack web_function built before the layers were composed by Seastar.
+NESTED_FUNCTION = ExceptionMiddleware(LifespanMiddleware(ROUTE))
+NESTED_NOT_FOUND_FUNCTION = ExceptionMiddleware(LifespanMiddleware(NOT_FOUND_ROUTE))
+COMPOSED_FUNCTION = Seastar(ROUTE)
+COMPOSED_NOT_FOUND_FUNCTION = Seastar(NOT_FOUND_ROUTE)
+MANUAL_PARAMS_FUNCTION = web_function("/items/{item_id:int}")(manual_params)
+INJECTED_PARAMS_FUNCTION = web_function("/items/{item_id:int}")(injected_params)
+CORS_FUNCTION = web_function(
+    "/items/{item_id:int}",
+    middleware=[Middleware(CORSMiddleware, allow_origins=["https://example.org"])],
+)(hello)
+PREFLIGHT_EVENT = make_event("OPTIONS")
+PREFLIGHT_EVENT["http"]["headers"].update(
+    {"origin": "https://example.org", "access-control-request-method": "GET"}
+)
+BATCH_FUNCTION = BatchMiddleware(GET_FUNCTION)
+BATCH_EVENT = {"batch": [copy_event(GET_EVENT) for _ in range(100)]}
+JSON_FUNCTION = web_function("/items/{item_id:int}", methods=["POST"])(echo_json)
+
+MISSING_EVENT = make_event(path="/wp-login.php")
+POST_EVENT = make_event("POST")
+
+
+def fail(request: Request) -> PlainTextResponse:
+    raise RuntimeError()
+
+
+FAILING_APP = ServerErrorMiddleware(request_response(fail))
+
+SMALL_PAYLOAD = make_payload(10)
+LARGE_PAYLOAD = make_payload(5000)
+RESPONSE = JSONResponse(SMALL_PAYLOAD)
+
+
+@benchmark("event.copy")
+def bench_event_copy() -> Any:
+    # The cost every other event based benchmark includes.
+    return copy_event(GET_EVENT)
+
+
+@benchmark("route.matches")
+def bench_route_matches() -> Any:
+    return ROUTE.matches(GET_EVENT)
+
+
+@benchmark("request.properties")
+def bench_request_properties() -> Any:
+    request = Request(GET_EVENT)
+    return (request.method, request.path, request.headers["host"], request.cookies)
+
+
+@benchmark("request.properties.50_headers")
+def bench_request_properties_many_headers() -> Any:
+    request = Request(MANY_HEADERS_EVENT)
+    return (request.headers["host"], request.query_params["param10"])
+
+
+@benchmark("request.one_header.60_headers")
+def bench_request_one_header() -> Any:
+    return Request(LONG_QUERY_EVENT).headers["user-agent"]
+
+
+@benchmark("request.one_query_param.200_params")
+def bench_request_one_query_param() -> Any:
+    return Request(LONG_QUERY_EVENT).query_params["param150"]
+
+
+@benchmark("starlette.one_header.60_headers")
+def bench_starlette_one_header() -> Any:
+    # The Headers Request used before it read the event lazily.
+    from starlette.datastructures import Headers
+
+    return Headers(LONG_QUERY_EVENT["http"]["headers"])["user-agent"]
+
+
+@benchmark("starlette.one_query_param.200_params")
+def bench_starlette_one_query_param() -> Any:
+    from starlette.datastructures import QueryParams
+
+    return QueryParams(LONG_QUERY_EVENT["http"]["queryString"])["param150"]
+
+
+@benchmark("request.json.100_rows")
+def bench_request_json() -> Any:
+    return Request(JSON_EVENT).json()
+
+
+@benchmark("request.json.100_rows.base64")
+def bench_request_json_base64() -> Any:
+    return Request(BASE64_EVENT).json()
+
+
+@benchmark("request.json.5000_rows")
+def bench_request_json_large() -> Any:
+    return Request(LARGE_JSON_EVENT).json()
+
+
+@benchmark("jsonresponse.render.10_rows")
+def bench_render_small() -> Any:
+    return JSONResponse(SMALL_PAYLOAD)
+
+
+@benchmark("jsonresponse.render.5000_rows")
+def bench_render_large() -> Any:
+    return JSONResponse(LARGE_PAYLOAD)
+
+
+@benchmark("response.call")
+def bench_response_call() -> Any:
+    return RESPONSE()
+
+
+@benchmark("app")
+def bench_app() -> Any:
+    return APP(copy_event(GET_EVENT), None)  # type: ignore[arg-type]
+
+
+@benchmark("exception_middleware")
+def bench_exception_middleware() -> Any:
+    return EXCEPTION_APP(copy_event(GET_EVENT), None)  # type: ignore[arg-type]
+
+
+@benchmark("exception_middleware.http_exception")
+def bench_exception_middleware_raise() -> Any:
+    return NOT_FOUND_EXCEPTION_APP(copy_event(GET_EVENT), None)  # type: ignore
+
+
+@benchmark("server_error_middleware")
+def bench_server_error_middleware() -> Any:
+    return SERVER_ERROR_APP(copy_event(GET_EVENT), None)  # type: ignore[arg-type]
+
+
+@benchmark("web_function.get")
+def bench_web_function_get() -> Any:
+    return GET_FUNCTION(copy_event(GET_EVENT), None)  # type: ignore[arg-type]
+
+
+@benchmark("nesting.nested.get")
+def bench_nested_get() -> Any:
+    return NESTED_FUNCTION(copy_event(GET_EVENT), None)  # type: ignore[arg-type]
+
+
+@benchmark("nesting.nested.http_exception")
+def bench_nested_http_exception() -> Any:
+    return NESTED_NOT_FOUND_FUNCTION(copy_event(GET_EVENT), None)  # type: ignore
+
+
+@benchmark("nesting.composed.get")
+def bench_composed_get() -> Any:
+    return COMPOSED_FUNCTION(copy_event(GET_EVENT), None)  # type: ignore[arg-type]
+
+
+@benchmark("nesting.composed.http_exception")
+def bench_composed_http_exception() -> Any:
+    return COMPOSED_NOT_FOUND_FUNCTION(copy_event(GET_EVENT), None)  # type: ignore
+
+
+@benchmark("params.manual")
+def bench_params_manual() -> Any:
+    return MANUAL_PARAMS_FUNCTION(copy_event(GET_EVENT), None)  # type: ignore
+
+
+@benchmark("params.injected")
+def bench_params_injected() -> Any:
+    return INJECTED_PARAMS_FUNCTION(copy_event(GET_EVENT), None)  # type: ignore
+
+
+@benchmark("cors.preflight")
+def bench_cors_preflight() -> Any:
+    return CORS_FUNCTION(copy_event(PREFLIGHT_EVENT), None)  # type: ignore
+
+
+@benchmark("batch.100_get")
+def bench_batch() -> Any:
+    # Compare with 100 times web_function.get.
+    return BATCH_FUNCTION(BATCH_EVENT, None)  # type: ignore[arg-type]
+
+
+@benchmark("errors.not_found")
+def bench_not_found() -> Any:
+    return ROUTE(copy_event(MISSING_EVENT), None)  # type: ignore[arg-type]
+
+
+@benchmark("errors.method_not_allowed")
+def bench_method_not_allowed() -> Any:
+    return ROUTE(copy_event(POST_EVENT), None)  # type: ignore[arg-type]
+
+
+@benchmark("errors.server_error")
+def bench_server_error() -> Any:
+    return FAILING_APP(copy_event(GET_EVENT), None)  # type: ignore[arg-type]
+
+
+@benchmark("web_function.post_json")
+def bench_web_function_post() -> Any:
+    event = copy_event(JSON_EVENT)
+    event["http"]["path"] = "/items/42"
+    return JSON_FUNCTION(event, None)  # type: ignore[arg-type]
+
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float) -> dict[str, Any]:
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+
+    timings = [t / number * 1e9 for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "ns_per_op": min(timings),
+        "median_ns_per_op": statistics.median(timings),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name, result in results["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            continue
+
+        before = baseline["benchmarks"][name]["ns_per_op"]
+        after = result["ns_per_op"]
+        ratio = after / before
+        flag = " !" if ratio > threshold else ""
+        print(f"{name:<40} {before:>10.0f}ns {after:>10.0f}ns {ratio:>7.2f}x{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", "--filter", default="", help="run matching names")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--save", help="write the results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "benchmarks": {},
+    }
+    for name, func in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+
+        result = measure(func, args.repeat, args.min_time)
+        results["benchmarks"][name] = result
+        print(f"{name:<40} {result['ns_per_op']:>10.0f}ns")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nFAIL: slower than {args.threshold}x the baseline:")
+            for name in regressions:
+                print(f"  {name}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
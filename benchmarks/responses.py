@@ -0,0 +1,73 @@
+"""
+Compare the native responses against the previous ones built on starlette's
+Response, which encoded every header to bytes in raw_headers and decoded
+them back into the dict of the result, in time and memory per response.
+
+    python benchmarks/responses.py --number 100000
+"""
+import argparse
+import timeit
+import tracemalloc
+from typing import Any, Callable, Optional
+
+from starlette import responses
+
+from seastar import json
+from seastar.responses import JSONResponse
+
+
+class LegacyJSONResponse(responses.Response):
+    media_type = "application/json"
+
+    def __init__(self, content: Any, headers: Optional[dict[str, str]] = None):
+        super().__init__(content=content, headers=headers, background=None)
+
+    def render(self, content: Any) -> Any:
+        return json.dumps(content)
+
+    def __call__(self) -> dict[str, Any]:  # type: ignore[override]
+        result: dict[str, Any] = {"statusCode": self.status_code, "body": self.body}
+        headers = dict(self.headers)
+        if headers:
+            result["headers"] = headers
+        return result
+
+
+def retained(make: Callable[[], Any], number: int) -> float:
+    """
+    The memory held by a response until it is garbage collected.
+    """
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        kept = [make() for _ in range(number)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return (after - before) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    content = {"hello": "world"}
+    headers = {"Cache-Control": "no-store", "X-Request-Id": "abc123"}
+    assert JSONResponse(content, headers=headers)() == LegacyJSONResponse(
+        content, headers=headers
+    )()
+
+    results = {}
+    for name, cls in (("starlette", LegacyJSONResponse), ("native", JSONResponse)):
+        timer = timeit.Timer(lambda: cls(content, headers=headers)())
+        results[name] = min(timer.repeat(repeat=5, number=args.number)) / args.number
+        memory = retained(lambda: cls(content, headers=headers), 1000)
+        print(f"{name:<10} {results[name] * 1e6:8.2f}us {memory:8.0f}B per response")
+
+    print(f"speedup    {results['starlette'] / results['native']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
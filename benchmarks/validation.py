@@ -0,0 +1,120 @@
+"""
+Compare the compiled validators against validating by reflection on every
+request, which inspects the type hints of the schema for each value.
+
+    python benchmarks/validation.py --rows 100
+"""
+import argparse
+import dataclasses
+from enum import Enum
+import timeit
+from typing import (
+    Any,
+    Optional,
+    TypedDict,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from seastar.validation import ValidationError, compile_schema
+
+
+class Status(Enum):
+    ACTIVE = "active"
+    INACTIVE = "inactive"
+
+
+@dataclasses.dataclass
+class Address:
+    street: str
+    city: str
+
+
+@dataclasses.dataclass
+class User:
+    id: int
+    name: str
+    status: Status
+    address: Address
+    tags: list[str]
+    score: Optional[float] = None
+
+
+class Payload(TypedDict):
+    users: list[User]
+
+
+def naive_validate(schema: Any, value: Any, loc: tuple[Any, ...] = ()) -> Any:
+    origin = get_origin(schema)
+    if origin is Union:
+        if value is None and type(None) in get_args(schema):
+            return None
+        schema = next(arg for arg in get_args(schema) if arg is not type(None))
+        return naive_validate(schema, value, loc)
+
+    if origin is list:
+        (item_type,) = get_args(schema)
+        return [naive_validate(item_type, v, (*loc, i)) for i, v in enumerate(value)]
+
+    if dataclasses.is_dataclass(schema) or hasattr(schema, "__required_keys__"):
+        hints = get_type_hints(schema)
+        result = {
+            name: naive_validate(hint, value[name], (*loc, name))
+            for name, hint in hints.items()
+            if name in value
+        }
+        return schema(**result)
+
+    if isinstance(schema, type) and issubclass(schema, Enum):
+        return schema(value)
+
+    if schema is float and isinstance(value, int):
+        return float(value)
+
+    if not isinstance(value, schema):
+        raise ValidationError([{"loc": list(loc), "msg": "invalid"}])
+    return value
+
+
+def make_payload(rows: int) -> dict[str, Any]:
+    return {
+        "users": [
+            {
+                "id": i,
+                "name": f"user-{i}",
+                "status": "active",
+                "address": {"street": "1 Main St", "city": "Springfield"},
+                "tags": ["a", "b"],
+                "score": 1,
+            }
+            for i in range(rows)
+        ]
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--number", type=int, default=100)
+    args = parser.parse_args()
+
+    payload = make_payload(args.rows)
+    compiled = compile_schema(Payload, "body")
+    assert compiled(payload) == naive_validate(Payload, payload)
+
+    results = {}
+    for name, func in (
+        ("naive", lambda: naive_validate(Payload, payload)),
+        ("compiled", lambda: compiled(payload)),
+    ):
+        timer = timeit.Timer(func)
+        results[name] = min(timer.repeat(repeat=5, number=args.number)) / args.number
+        print(f"{name:<10} {results[name] * 1e6:8.1f}us for {args.rows} rows")
+
+    print(f"speedup    {results['naive'] / results['compiled']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
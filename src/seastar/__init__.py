@@ -1,15 +1,41 @@
-from typing import Callable, Optional
-from seastar.middleware.exceptions import ExceptionMiddleware
+from collections.abc import Sequence
+from typing import Any, Callable, Optional, Union
+from seastar.applications import Seastar
+from seastar.middleware import Middleware
 from seastar.routing import Route
-from seastar.types import WebHandler, EventHandler
+from seastar.types import AsyncWebHandler, Endpoint, WebHandler, LifespanHook
 
 
 def web_function(
-    path: str = "", /, *, methods: Optional[list[str]] = None
-) -> Callable[[WebHandler], EventHandler]:
-    def decorator(func: WebHandler) -> EventHandler:
-        route = Route(path=path, endpoint=func, methods=methods)
-        app = ExceptionMiddleware(route)
-        return app
+    path: str = "",
+    /,
+    *,
+    methods: Optional[list[str]] = None,
+    max_body_size: Optional[int] = None,
+    cache_ttl: Optional[float] = None,
+    cache_vary: Sequence[str] = (),
+    body_schema: Optional[Any] = None,
+    parameters_schema: Optional[Any] = None,
+    on_startup: Optional[Sequence[LifespanHook]] = None,
+    on_shutdown: Optional[Sequence[LifespanHook]] = None,
+    middleware: Optional[Sequence[Middleware]] = None,
+) -> Callable[[Union[WebHandler, AsyncWebHandler, Endpoint]], Seastar]:
+    def decorator(func: Union[WebHandler, AsyncWebHandler, Endpoint]) -> Seastar:
+        route = Route(
+            path=path,
+            endpoint=func,
+            methods=methods,
+            max_body_size=max_body_size,
+            cache_ttl=cache_ttl,
+            cache_vary=cache_vary,
+            body_schema=body_schema,
+            parameters_schema=parameters_schema,
+        )
+        return Seastar(
+            route,
+            middleware=middleware,
+            on_startup=on_startup,
+            on_shutdown=on_shutdown,
+        )
 
     return decorator
@@ -0,0 +1,93 @@
+from collections.abc import Mapping, Sequence
+from typing import Callable, Optional, Union
+
+from seastar.datastructures import State
+from seastar.middleware import Middleware
+from seastar.middleware.exceptions import ExceptionMiddleware
+from seastar.middleware.lifespan import Lifespan
+from seastar.routing import drop_body
+from seastar.types import (
+    AsyncWebExceptionHandler,
+    Context,
+    Event,
+    EventHandler,
+    HandlerResult,
+    LifespanHook,
+    WebExceptionHandler,
+)
+
+
+class Seastar:
+    """
+    Composes the app with its middleware once, when it is created:
+
+        middleware[0] -> ... -> middleware[-1] -> ExceptionMiddleware -> app
+
+    so that the middleware also sees the results of the exception handlers.
+    An HTTPException raised by the middleware itself is handled here.
+
+    Every invocation gets a single scope, created here, which makes the
+    application the entry point and is shared by all the layers along with
+    the Request they parse.
+    """
+
+    def __init__(
+        self,
+        app: EventHandler,
+        *,
+        middleware: Optional[Sequence[Middleware]] = None,
+        exception_handlers: Optional[
+            Mapping[Union[int, type[Exception]], WebExceptionHandler]
+        ] = None,
+        on_startup: Optional[Sequence[LifespanHook]] = None,
+        on_shutdown: Optional[Sequence[LifespanHook]] = None,
+    ) -> None:
+        self.app = app
+        self.lifespan = Lifespan(on_startup=on_startup, on_shutdown=on_shutdown)
+        self.user_middleware = [] if middleware is None else list(middleware)
+
+        self.exception_middleware = ExceptionMiddleware(
+            app, handlers=exception_handlers
+        )
+        stack: EventHandler = self.exception_middleware
+        for layer in reversed(self.user_middleware):
+            stack = layer(stack)
+        self.middleware_stack = stack
+
+    @property
+    def state(self) -> State:
+        return self.lifespan.state
+
+    def __call__(self, event: Event, context: Context) -> HandlerResult:
+        if not self.lifespan.started:
+            self.lifespan.startup()
+
+        scope = event.get("__seastar")
+        if scope is None:
+            event["__seastar"] = {"entry_point": self, "state": self.lifespan.state}
+        else:
+            scope.setdefault("entry_point", self)
+            scope["state"] = self.lifespan.state
+
+        try:
+            result = self.middleware_stack(event, context)
+        except Exception as exc:
+            result = self.exception_middleware.handle(event, exc)
+
+        if "http" in event and event["http"]["method"] == "HEAD":
+            return drop_body(result)
+        return result
+
+    __code__ = __call__.__code__
+
+    def add_exception_handler(
+        self,
+        key: Union[int, type[Exception]],
+        handler: Union[WebExceptionHandler, AsyncWebExceptionHandler],
+    ) -> None:
+        self.exception_middleware.add_exception_handler(key, handler)
+
+    def exception_handler(
+        self, key: Union[int, type[Exception]]
+    ) -> Callable[[WebExceptionHandler], WebExceptionHandler]:
+        return self.exception_middleware.exception_handler(key)
@@ -0,0 +1,148 @@
+import contextvars
+import functools
+import inspect
+import os
+import threading
+from typing import Any, Awaitable, Callable, Iterable, Optional, TypeVar, TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+
+T = TypeVar("T")
+
+_loop: Optional["asyncio.AbstractEventLoop"] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+_executor: Optional["ThreadPoolExecutor"] = None
+_executor_lock = threading.Lock()
+
+
+def is_async_callable(obj: Any) -> bool:
+    while isinstance(obj, functools.partial):
+        obj = obj.func
+
+    return inspect.iscoroutinefunction(obj) or (
+        callable(obj) and inspect.iscoroutinefunction(obj.__call__)
+    )
+
+
+def get_event_loop() -> "asyncio.AbstractEventLoop":
+    """
+    Return the event loop shared by the whole container, starting it in a
+    daemon thread the first time. The loop is kept for as long as the
+    container is warm so that async clients and their connection pools,
+    ex. created by a startup hook, can be reused across invocations and by
+    handlers running in other threads.
+    """
+    global _loop, _loop_thread
+    if _loop is None or _loop.is_closed():
+        with _loop_lock:
+            if _loop is None or _loop.is_closed():
+                # asyncio is only imported when an async handler is used.
+                import asyncio
+
+                loop = asyncio.new_event_loop()
+                _loop_thread = threading.Thread(
+                    target=run_forever, args=(loop,), name="seastar-loop", daemon=True
+                )
+                _loop_thread.start()
+                _loop = loop
+    return _loop
+
+
+def run_forever(loop: "asyncio.AbstractEventLoop") -> None:
+    import asyncio
+
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+async def _await(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+def run_until_complete(awaitable: Awaitable[T]) -> T:
+    """
+    Run the awaitable on the shared event loop and wait for its result in
+    the current thread. It runs with a copy of the current context, like a
+    function run in a thread pool.
+    """
+    from concurrent.futures import CancelledError, Future
+
+    loop = get_event_loop()
+    if threading.current_thread() is _loop_thread:
+        raise RuntimeError("run_until_complete() cannot be called from the event loop")
+
+    context = contextvars.copy_context()
+    future: Future[T] = Future()
+
+    def start() -> None:
+        # the task runs in a copy of the context it is created in.
+        task = context.run(loop.create_task, _await(awaitable))
+
+        def done(task: "asyncio.Task[T]") -> None:
+            if task.cancelled():
+                future.set_exception(CancelledError())
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+        task.add_done_callback(done)
+
+    loop.call_soon_threadsafe(start)
+    return future.result()
+
+
+def get_executor() -> "ThreadPoolExecutor":
+    """
+    Return the thread pool used to run blocking calls in parallel. It is
+    created on first use and kept for as long as the container is warm. The
+    number of workers can be set with the SEASTAR_MAX_WORKERS environment
+    variable.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                max_workers = int(os.environ.get("SEASTAR_MAX_WORKERS", 8))
+                _executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="seastar"
+                )
+    return _executor
+
+
+def run_parallel(
+    funcs: Iterable[Callable[[], T]], timeout: Optional[float] = None
+) -> list[T]:
+    """
+    Run the functions in the thread pool and return their results in order.
+    The first exception raised by a function is re-raised and, like a
+    timeout, cancels the functions that have not started yet.
+    Raises TimeoutError if timeout seconds pass first.
+    """
+    from concurrent.futures import FIRST_EXCEPTION, wait
+
+    executor = get_executor()
+    futures = [
+        executor.submit(contextvars.copy_context().run, func) for func in funcs
+    ]
+
+    done, not_done = wait(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+    for future in not_done:
+        future.cancel()
+
+    for future in futures:
+        if future in done and future.exception() is not None:
+            raise future.exception()  # type: ignore[misc]
+
+    if not_done:
+        raise TimeoutError()
+
+    return [future.result() for future in futures]
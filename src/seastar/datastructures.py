@@ -0,0 +1,194 @@
+from collections.abc import Iterator, Mapping
+from typing import Any, Optional
+from urllib.parse import unquote_plus
+
+from seastar.types import HeaderValue
+
+
+def get_header(headers: Mapping[str, HeaderValue], name: str) -> Optional[str]:
+    """
+    Case-insensitive lookup of a header in a plain dictionary.
+    The name is expected to be lowercase. The values of a repeated header,
+    kept as a list in results, are joined as a single comma separated value.
+    """
+    if name in headers:
+        value = headers[name]
+    else:
+        for key, value in headers.items():
+            if key.lower() == name:
+                break
+        else:
+            return None
+
+    if isinstance(value, list):
+        return ", ".join(value)
+    return value
+
+
+class State:
+    """
+    An object that can be used to store arbitrary state.
+    """
+
+    def __init__(self, state: Optional[dict[str, Any]] = None):
+        if state is None:
+            state = {}
+        super().__setattr__("_state", state)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        self._state[key] = value
+
+    def __getattr__(self, key: str) -> Any:
+        try:
+            return self._state[key]
+        except KeyError:
+            message = "'{}' object has no attribute '{}'"
+            raise AttributeError(message.format(self.__class__.__name__, key))
+
+    def __delattr__(self, key: str) -> None:
+        del self._state[key]
+
+
+class Headers(Mapping[str, str]):
+    """
+    A read-only, case-insensitive view of the headers of an event. Lookups
+    go straight to the event's dictionary, whose keys are usually lowercase,
+    an index of the lowercased keys is only built for keys that are not.
+    """
+
+    __slots__ = ("_headers", "_lower")
+
+    def __init__(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        self._headers = {} if headers is None else headers
+        self._lower: Optional[dict[str, str]] = None
+
+    def _index(self) -> dict[str, str]:
+        if self._lower is None:
+            self._lower = {k.lower(): v for k, v in self._headers.items()}
+        return self._lower
+
+    def __getitem__(self, key: str) -> str:
+        key = key.lower()
+        try:
+            return self._headers[key]
+        except KeyError:
+            return self._index()[key]
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        key = key.lower()
+        return key in self._headers or key in self._index()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index())
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def getlist(self, key: str) -> list[str]:
+        value = self.get(key)
+        return [] if value is None else [value]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self._headers)!r})"
+
+
+class QueryParams(Mapping[str, str]):
+    """
+    A read-only view of a query string. Looking up a key scans the string
+    for it, the string is only split into all of its pairs when it is
+    iterated or when it has to be decoded. Values are decoded when they are
+    looked up. Like starlette's QueryParams the last value of a repeated key
+    wins and blank values are kept.
+    """
+
+    __slots__ = ("_query_string", "_raw", "_decoded")
+
+    def __init__(self, query_string: str = "") -> None:
+        self._query_string = query_string
+        self._raw: Optional[dict[str, list[str]]] = None
+        self._decoded: dict[str, list[str]] = {}
+
+    def _pairs(self) -> dict[str, list[str]]:
+        if self._raw is None:
+            raw: dict[str, list[str]] = {}
+            for pair in self._query_string.split("&"):
+                if not pair:
+                    continue
+                key, _, value = pair.partition("=")
+                if "%" in key or "+" in key:
+                    key = unquote_plus(key)
+                raw.setdefault(key, []).append(value)
+            self._raw = raw
+        return self._raw
+
+    def _scan(self, key: str) -> list[str]:
+        query_string = self._query_string
+        size = len(query_string)
+        values: list[str] = []
+        start = 0
+        while True:
+            index = query_string.find(key, start)
+            if index == -1:
+                return values
+
+            end = index + len(key)
+            start = end
+            if index and query_string[index - 1] != "&":
+                continue
+            if end == size or query_string[end] == "&":
+                values.append("")
+            elif query_string[end] == "=":
+                stop = query_string.find("&", end)
+                start = size if stop == -1 else stop
+                values.append(query_string[end + 1 : start])
+
+    def getlist(self, key: str) -> list[str]:
+        try:
+            return self._decoded[key]
+        except KeyError:
+            pass
+
+        if (
+            self._raw is None
+            and key
+            and "&" not in key
+            and "=" not in key
+            and "%" not in self._query_string
+            and "+" not in self._query_string
+        ):
+            raw_values = self._scan(key)
+        else:
+            raw_values = self._pairs().get(key, [])
+
+        values = [
+            unquote_plus(value) if "%" in value or "+" in value else value
+            for value in raw_values
+        ]
+        self._decoded[key] = values
+        return values
+
+    def __getitem__(self, key: str) -> str:
+        values = self.getlist(key)
+        if not values:
+            raise KeyError(key)
+        return values[-1]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and bool(self.getlist(key))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._pairs())
+
+    def __len__(self) -> int:
+        return len(self._pairs())
+
+    def multi_items(self) -> list[tuple[str, str]]:
+        return [(key, value) for key in self for value in self.getlist(key)]
+
+    def __str__(self) -> str:
+        return self._query_string
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._query_string!r})"
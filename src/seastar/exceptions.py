@@ -1,6 +1,30 @@
+from typing import Optional
+
+from starlette.exceptions import HTTPException
+
+from seastar.types import HandlerResult
+
+
 class SeastarException(Exception):
     pass
 
 
 class WebEventException(SeastarException):
     pass
+
+
+class PrecomputedHTTPException(HTTPException):
+    """
+    An HTTPException raised with the result it is answered with when no
+    handler is registered for it, so that the framework's own errors, ex. a
+    405, are not rendered again on every request.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        result: HandlerResult,
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        super().__init__(status_code=status_code, headers=headers)
+        self.result = result
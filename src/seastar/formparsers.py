@@ -0,0 +1,206 @@
+"""
+A multipart/form-data parser working over the decoded body of an event.
+
+The body of a function invocation is already in memory, so parts are not
+copied out of it: files are exposed as UploadFile objects backed by a
+memoryview of the body and only text fields are decoded to str. Parts are
+parsed one at a time and the limits are checked as each one is found, so an
+oversized upload is rejected before the rest of the body is looked at.
+"""
+from collections.abc import Iterator
+import re
+from typing import Optional, Union
+from urllib.parse import unquote
+
+from starlette.exceptions import HTTPException
+
+
+# A parameter of a header value, ex. '; name="file"' or "; filename*=utf-8''a.txt"
+OPTION_REGEX = re.compile(r';\s*([^\s=;]+)\s*=\s*("(?:\\.|[^"\\])*"|[^;]*)')
+
+
+def parse_options_header(value: str) -> tuple[str, dict[str, str]]:
+    """
+    Split a header like Content-Type or Content-Disposition into its value and
+    its lowercased parameters.
+    """
+    main, _, rest = value.partition(";")
+    options: dict[str, str] = {}
+    for match in OPTION_REGEX.finditer(";" + rest):
+        key, option = match.group(1).lower(), match.group(2).strip()
+        if option.startswith('"') and option.endswith('"'):
+            option = option[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+
+        if key.endswith("*"):
+            # RFC 5987, ex. filename*=utf-8''na%C3%AFve.txt
+            charset, _, encoded = option.partition("''")
+            try:
+                option = unquote(encoded, encoding=charset or "utf-8")
+            except LookupError:
+                continue
+            key = key[:-1]
+        elif key in options:
+            # the extended form takes precedence.
+            continue
+        options[key] = option
+    return main.strip().lower(), options
+
+
+class UploadFile:
+    """
+    A file of a multipart body. Its content is a view of the request body,
+    reading it is the only time it is copied.
+    """
+
+    __slots__ = ("filename", "content_type", "headers", "_data", "_position")
+
+    def __init__(
+        self,
+        data: memoryview,
+        *,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.filename = filename
+        self.content_type = content_type
+        self.headers = {} if headers is None else headers
+        self._data = data
+        self._position = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._data)
+
+    @property
+    def data(self) -> memoryview:
+        return self._data
+
+    def read(self, size: int = -1) -> bytes:
+        start = self._position
+        end = len(self._data) if size < 0 else min(start + size, len(self._data))
+        self._position = end
+        return self._data[start:end].tobytes()
+
+    def seek(self, offset: int) -> None:
+        self._position = max(0, min(offset, len(self._data)))
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        self._data.release()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"filename={self.filename!r}, size={self.size}, headers={self.headers!r})"
+        )
+
+
+class MultiPartParser:
+    """
+    Parses a multipart/form-data body into (name, value) pairs, values are
+    str for fields and UploadFile for files.
+
+    A part larger than max_part_size or more than max_parts parts is a 413,
+    a malformed body is a 400.
+    """
+
+    def __init__(
+        self,
+        body: bytes,
+        boundary: Union[str, bytes],
+        *,
+        max_part_size: Optional[int] = None,
+        max_parts: int = 1000,
+        charset: str = "utf-8",
+    ) -> None:
+        if isinstance(boundary, str):
+            boundary = boundary.encode("latin-1")
+        self.body = body
+        self.delimiter = b"--" + boundary
+        self.max_part_size = max_part_size
+        self.max_parts = max_parts
+        self.charset = charset
+
+    def parse(self) -> Iterator[tuple[str, Union[str, UploadFile]]]:
+        body = self.body
+        view = memoryview(body)
+        delimiter = self.delimiter
+        # every delimiter but the first is preceded by a line break.
+        separator = b"\r\n" + delimiter
+
+        position = body.find(delimiter)
+        if position == -1:
+            raise HTTPException(400, "Missing multipart boundary")
+        position += len(delimiter)
+
+        count = 0
+        while True:
+            if body.startswith(b"--", position):
+                return
+            if not body.startswith(b"\r\n", position):
+                raise HTTPException(400, "Malformed multipart boundary")
+
+            count += 1
+            if count > self.max_parts:
+                raise HTTPException(413, "Too many multipart parts")
+
+            headers_end = body.find(b"\r\n\r\n", position + 2)
+            if headers_end == -1:
+                raise HTTPException(400, "Malformed multipart headers")
+            headers = self.parse_headers(body[position + 2 : headers_end])
+
+            start = headers_end + 4
+            # the search stops at max_part_size, an oversized part is not scanned.
+            limit = len(body)
+            if self.max_part_size is not None:
+                limit = min(limit, start + self.max_part_size + len(separator))
+            end = body.find(separator, start, limit)
+            if end == -1:
+                if limit < len(body):
+                    raise HTTPException(413, "Multipart part too large")
+                raise HTTPException(400, "Missing closing multipart boundary")
+
+            yield self.make_part(headers, view[start:end])
+            position = end + len(separator)
+
+    def parse_headers(self, block: bytes) -> dict[str, str]:
+        headers = {}
+        if block:
+            for line in block.decode("latin-1").split("\r\n"):
+                name, colon, value = line.partition(":")
+                if not colon:
+                    raise HTTPException(400, "Malformed multipart headers")
+                headers[name.strip().lower()] = value.strip()
+        return headers
+
+    def make_part(
+        self, headers: dict[str, str], data: memoryview
+    ) -> tuple[str, Union[str, UploadFile]]:
+        disposition, options = parse_options_header(
+            headers.get("content-disposition", "")
+        )
+        if disposition != "form-data" or "name" not in options:
+            raise HTTPException(400, "Missing multipart Content-Disposition")
+
+        name = options["name"]
+        if "filename" in options:
+            upload = UploadFile(
+                data,
+                filename=options["filename"],
+                content_type=headers.get("content-type"),
+                headers=headers,
+            )
+            return name, upload
+
+        charset = self.charset
+        if "content-type" in headers:
+            charset = parse_options_header(headers["content-type"])[1].get(
+                "charset", charset
+            )
+        try:
+            return name, str(data, charset)
+        except (LookupError, UnicodeDecodeError):
+            raise HTTPException(400, "Invalid multipart field encoding")
@@ -1,22 +1,210 @@
-from dataclasses import asdict, is_dataclass
+from dataclasses import fields, is_dataclass
 from datetime import datetime, date, time
 from enum import Enum
-import inspect
+import json
 from json import JSONEncoder
-from typing import Any
+from math import isfinite
+from operator import attrgetter
+import os
+from typing import Any, Callable, Optional, Union
 from uuid import UUID
 
 
+Encoder = Callable[[Any], Any]
+
+
+_encoders: dict[type, Encoder] = {
+    datetime: lambda o: o.isoformat(),
+    date: lambda o: o.isoformat(),
+    time: lambda o: o.isoformat(),
+    Enum: lambda o: o.value,
+    UUID: str,
+}
+
+# Resolved encoders by exact type, including misses.
+_encoder_cache: dict[type, Optional[Encoder]] = {}
+
+
+def register_encoder(cls: type, encoder: Encoder) -> None:
+    """
+    Register a function that converts instances of cls (and its subclasses)
+    into something JSON serializable.
+    """
+    _encoders[cls] = encoder
+    _encoder_cache.clear()
+
+
+def lookup_encoder(cls: type) -> Optional[Encoder]:
+    try:
+        return _encoder_cache[cls]
+    except KeyError:
+        pass
+
+    encoder = None
+    for base in cls.__mro__:
+        if base in _encoders:
+            encoder = _encoders[base]
+            break
+    else:
+        if is_dataclass(cls):
+            encoder = dataclass_encoder(cls)
+
+    _encoder_cache[cls] = encoder
+    return encoder
+
+
+def dataclass_encoder(cls: type) -> Encoder:
+    """
+    Unlike dataclasses.asdict() the values are not copied or recursed into,
+    the JSON encoder will call default() again for nested objects.
+    """
+    names = tuple(field.name for field in fields(cls))
+    if len(names) < 2:
+        return lambda o: {name: getattr(o, name) for name in names}
+
+    getter = attrgetter(*names)
+    return lambda o: dict(zip(names, getter(o)))
+
+
 class JsonEncoder(JSONEncoder):
     def default(self, o: Any) -> Any:
-        if not inspect.isclass(o) and is_dataclass(o):
-            return asdict(o)
+        encoder = lookup_encoder(type(o))
+        if encoder is not None:
+            return encoder(o)
+
+
+class JsonBackend:
+    """
+    Encodes and decodes JSON for JSONResponse and Request.json().
+    Encoding is compact, does not escape non-ascii characters and rejects
+    NaN and Infinity, as well as supporting the extra types of JsonEncoder.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(
+            obj,
+            ensure_ascii=False,
+            allow_nan=False,
+            cls=JsonEncoder,
+            indent=None,
+            separators=(",", ":"),
+        )
+
+    def loads(self, s: Union[str, bytes]) -> Any:
+        return json.loads(s)
+
+
+def may_be_non_finite(obj: Any) -> bool:
+    """
+    Whether obj contains a NaN or an Infinity. Objects other than the JSON
+    types, ex. dataclasses, are not searched and may contain one.
+    """
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        cls = type(value)
+        if cls is str or cls is int or cls is bool or value is None:
+            continue
+        if cls is float:
+            if not isfinite(value):
+                return True
+        elif cls is dict:
+            stack.extend(value.values())
+        elif cls is list or cls is tuple:
+            stack.extend(value)
+        else:
+            return True
+    return False
+
+
+class OrjsonBackend(JsonBackend):
+    """
+    A JsonBackend that uses orjson.
+
+    orjson encodes NaN and Infinity as null. When strict_nan is True, the
+    default, and the output contains a null, the object is searched for a
+    non-finite float and only encoded again with the standard library, which
+    rejects it, when one may be present. With strict_nan=False NaN and
+    Infinity are encoded as null.
+
+    Registered encoders only apply to types orjson does not serialize natively.
+    """
+
+    name = "orjson"
+
+    def __init__(self, strict_nan: bool = True) -> None:
+        import orjson
+
+        self.orjson = orjson
+        self.strict_nan = strict_nan
+        self.encoder = JsonEncoder()
+        self.fallback = JsonBackend()
+
+    def dumps(self, obj: Any) -> str:
+        try:
+            data = self.orjson.dumps(
+                obj,
+                default=self.encoder.default,
+                option=self.orjson.OPT_NON_STR_KEYS,
+            )
+        except self.orjson.JSONEncodeError:
+            # ex: integers larger than 64 bits. Let the standard library
+            # either encode it or raise the appropriate error.
+            return self.fallback.dumps(obj)
+
+        if self.strict_nan and b"null" in data and may_be_non_finite(obj):
+            return self.fallback.dumps(obj)
+
+        return data.decode()
+
+    def loads(self, s: Union[str, bytes]) -> Any:
+        return self.orjson.loads(s)
+
+
+BACKENDS: dict[str, type[JsonBackend]] = {
+    "json": JsonBackend,
+    "orjson": OrjsonBackend,
+}
+
+_backend: Optional[JsonBackend] = None
+
+
+def get_backend() -> JsonBackend:
+    """
+    Return the active backend. If one has not been set then the
+    SEASTAR_JSON_BACKEND environment variable is used, otherwise orjson
+    if it is installed, otherwise the standard library.
+    """
+    global _backend
+    if _backend is None:
+        name = os.environ.get("SEASTAR_JSON_BACKEND")
+        if name is not None:
+            set_backend(name)
+        else:
+            try:
+                set_backend("orjson")
+            except ImportError:
+                set_backend("json")
+
+    assert _backend is not None
+    return _backend
+
+
+def set_backend(backend: Union[str, JsonBackend]) -> None:
+    global _backend
+    if isinstance(backend, str):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown JSON backend '{backend}'.")
+        backend = BACKENDS[backend]()
+
+    _backend = backend
+
 
-        elif isinstance(o, (datetime, date, time)):
-            return o.isoformat()
+def dumps(obj: Any) -> str:
+    return get_backend().dumps(obj)
 
-        elif isinstance(o, Enum):
-            return o.value
 
-        elif isinstance(o, UUID):
-            return str(o)
+def loads(s: Union[str, bytes]) -> Any:
+    return get_backend().loads(s)
@@ -0,0 +1,22 @@
+from typing import Any
+
+from seastar.types import EventHandler
+
+
+class Middleware:
+    """
+    A middleware class and the options it is created with, ex:
+    Middleware(CompressionMiddleware, minimum_size=1000)
+    """
+
+    def __init__(self, cls: Any, **options: Any) -> None:
+        self.cls = cls
+        self.options = options
+
+    def __call__(self, app: EventHandler) -> EventHandler:
+        return self.cls(app, **self.options)  # type: ignore[no-any-return]
+
+    def __repr__(self) -> str:
+        options = ", ".join(f"{key}={value!r}" for key, value in self.options.items())
+        name = getattr(self.cls, "__name__", repr(self.cls))
+        return f"Middleware({name}{', ' if options else ''}{options})"
@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import logging
+from typing import Any, Optional, cast
+
+from seastar.middleware.errors import SERVER_ERROR_RESULT
+from seastar.responses import PlainTextResponse, copy_result
+from seastar.types import Context, Event, EventHandler, HandlerResult
+
+
+logger = logging.getLogger("seastar")
+
+
+class BatchMiddleware:
+    """
+    Handles a list of events in a single invocation, ex:
+
+        {"batch": [{"http": {...}}, {"name": "world"}, ...]}
+
+    Each item is dispatched through the app on its own, an item without an
+    'http' key is taken as the parameters of a request made with method to
+    path. The results are returned in order as {"batch": [result, ...]}.
+    An item that raises gets a 500 result without affecting the others.
+
+    Up to max_parallel items run at the same time in worker threads, the
+    default of 1 runs them one after the other in the invocation's thread.
+    Web events and invocations without the key are passed to the app unchanged.
+
+    It must be the outermost layer so that each item gets its own scope.
+    """
+
+    def __init__(
+        self,
+        app: EventHandler,
+        key: str = "batch",
+        max_parallel: int = 1,
+        method: str = "GET",
+        path: str = "",
+    ) -> None:
+        self.app = app
+        self.key = key
+        self.max_parallel = max_parallel
+        self.method = method.upper()
+        self.path = path
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_parallel, thread_name_prefix="seastar-batch"
+            )
+        return self._executor
+
+    def __call__(self, event: Event, context: Context) -> HandlerResult:
+        # web events merge their parameters into the event, a "batch" parameter
+        # of a request is not a batch.
+        items = event.get(self.key)
+        if "http" in event or not isinstance(items, list):
+            return self.app(event, context)
+
+        if self.max_parallel <= 1 or len(items) <= 1:
+            results = [self.handle(item, context) for item in items]
+        else:
+            futures = [
+                self.executor.submit(
+                    contextvars.copy_context().run, self.handle, item, context
+                )
+                for item in items
+            ]
+            results = [future.result() for future in futures]
+
+        return {self.key: results}  # type: ignore[dict-item]
+
+    def handle(self, item: Any, context: Context) -> HandlerResult:
+        if not isinstance(item, dict):
+            response = PlainTextResponse("Bad Request", status_code=400)
+            return response()
+
+        if "http" in item:
+            http = {"headers": {}, **item["http"]}
+        else:
+            http = {"method": self.method, "path": self.path, "headers": {}}
+        event = cast(Event, {**item, "http": http})
+
+        try:
+            return self.app(event, context)
+        except Exception:
+            logger.exception("Batch item failed")
+            return copy_result(SERVER_ERROR_RESULT)
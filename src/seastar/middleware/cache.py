@@ -0,0 +1,213 @@
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+import time
+from typing import Optional, cast
+from urllib.parse import parse_qsl
+
+from seastar import json
+from seastar.datastructures import get_header
+from seastar.responses import copy_result
+from seastar.scope import get_scope
+from seastar.types import Context, Event, EventHandler, HandlerResult, WebResult
+
+
+def parse_cache_control(value: Optional[str]) -> dict[str, Optional[str]]:
+    directives: dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+
+    for item in value.split(","):
+        key, _, arg = item.strip().partition("=")
+        if key:
+            directives[key.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def result_size(result: HandlerResult) -> int:
+    """
+    An estimate of the memory used by a result, which is dominated by the body.
+    """
+    web_result = cast(WebResult, result)
+    body = web_result.get("body")
+    if body is None:
+        size = 0
+    elif isinstance(body, str):
+        size = len(body)
+    else:
+        size = len(json.dumps(body))
+
+    for key, value in web_result.get("headers", {}).items():
+        if isinstance(value, list):
+            size += len(key) * len(value) + sum(map(len, value))
+        else:
+            size += len(key) + len(value)
+    return size
+
+
+class ResponseCache:
+    """
+    An LRU cache of results, bounded by the estimated size of the entries
+    in bytes. It lives for as long as the container is kept warm.
+    """
+
+    def __init__(self, max_size: int = 32 * 1024 * 1024) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, int, HandlerResult]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[HandlerResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires, size, result = entry
+        if expires <= time.monotonic():
+            self.delete(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def set(self, key: Hashable, result: HandlerResult, ttl: float) -> None:
+        size = result_size(result)
+        if size > self.max_size:
+            return
+
+        self.delete(key)
+        while self._entries and self.size + size > self.max_size:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+
+        self._entries[key] = (time.monotonic() + ttl, size, result)
+        self.size += size
+
+    def delete(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+# Shared by every route that does not provide its own cache.
+default_cache = ResponseCache()
+
+# Requests that identify a user, their results are not shared by default.
+CREDENTIAL_HEADERS = ("authorization", "cookie")
+
+
+class CacheMiddleware:
+    """
+    Memoizes the results of GET requests for ttl seconds.
+
+    The cache key is made of the method, path, path parameters, the query
+    string with its parameters sorted and the request headers named in vary.
+    Requests with 'Cache-Control: no-cache' skip the lookup and 'no-store'
+    skips the cache entirely. Only 200 results are stored, unless they are
+    marked no-store, no-cache or private, set a cookie or vary on a header
+    that is not in vary, ex. 'Vary: *'. As in a shared cache, the result of a
+    request with an Authorization or Cookie header that is not in vary is
+    only stored when it is marked public or has an s-maxage. A max-age or
+    s-maxage on the result takes the place of ttl.
+    """
+
+    def __init__(
+        self,
+        app: EventHandler,
+        ttl: float = 60,
+        *,
+        vary: Sequence[str] = (),
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        self.app = app
+        self.ttl = ttl
+        self.vary = tuple(header.lower() for header in vary)
+        self.cache = default_cache if cache is None else cache
+
+    def __call__(self, event: Event, context: Context) -> HandlerResult:
+        get_scope(event, self)
+
+        if "http" not in event or event["http"]["method"] != "GET":
+            return self.app(event, context)
+
+        request_headers = event["http"].get("headers", {})
+        directives = parse_cache_control(get_header(request_headers, "cache-control"))
+        if "no-store" in directives:
+            return self.app(event, context)
+
+        key = self.cache_key(event)
+        if "no-cache" not in directives:
+            result = self.cache.get(key)
+            if result is not None:
+                return self.copy_result(result)
+
+        result = self.app(event, context)
+        credentials = any(
+            get_header(request_headers, name) is not None
+            for name in CREDENTIAL_HEADERS
+            if name not in self.vary
+        )
+        ttl = self.result_ttl(result, credentials=credentials)
+        if ttl:
+            self.cache.set(key, self.copy_result(result), ttl)
+        return result
+
+    def cache_key(self, event: Event) -> Hashable:
+        http = event["http"]
+        path_params = http.get("path_params", {})
+        query = parse_qsl(http.get("queryString", ""), keep_blank_values=True)
+        headers = http.get("headers", {})
+        return (
+            http["method"],
+            http["path"],
+            tuple(sorted(path_params.items())),
+            tuple(sorted(query)),
+            tuple(get_header(headers, name) for name in self.vary),
+        )
+
+    def result_ttl(self, result: HandlerResult, *, credentials: bool = False) -> float:
+        if not result or result.get("statusCode", 200) != 200:
+            return 0
+
+        headers = cast(WebResult, result).get("headers", {})
+        if get_header(headers, "set-cookie") is not None:
+            return 0
+
+        # the key only includes the headers in self.vary, a result that varies
+        # on any other header, or on '*', cannot be reused.
+        vary = get_header(headers, "vary")
+        if vary is not None:
+            for name in vary.split(","):
+                if name.strip().lower() not in self.vary:
+                    return 0
+
+        directives = parse_cache_control(get_header(headers, "cache-control"))
+        if {"no-store", "no-cache", "private"} & directives.keys():
+            return 0
+        if credentials and not {"public", "s-maxage"} & directives.keys():
+            return 0
+
+        for directive in ("s-maxage", "max-age"):
+            value = directives.get(directive)
+            if value is not None:
+                try:
+                    return max(int(value), 0)
+                except ValueError:
+                    return 0
+
+        return self.ttl
+
+    def copy_result(self, result: HandlerResult) -> HandlerResult:
+        return copy_result(result)
@@ -0,0 +1,164 @@
+from binascii import a2b_base64, b2a_base64
+from typing import Callable, Optional, cast
+import zlib
+
+from seastar.datastructures import get_header
+from seastar.scope import get_scope
+from seastar.types import (
+    Context,
+    Event,
+    EventHandler,
+    HandlerResult,
+    HeaderValue,
+    WebResult,
+)
+
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+
+# Content types that are already compressed and would not get any smaller.
+UNCOMPRESSIBLE_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/gzip",
+    "application/zip",
+    "application/x-7z-compressed",
+    "application/x-bzip2",
+    "application/x-rar-compressed",
+    "application/octet-stream",
+)
+
+
+def gzip_compress(data: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+    return compressor.compress(data) + compressor.flush()
+
+
+def parse_accept_encoding(value: str) -> set[str]:
+    """
+    Return the encodings that are acceptable, ignoring those with q=0.
+    """
+    encodings = set()
+    for item in value.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        params = params.replace(" ", "")
+        if params in {"q=0", "q=0.0", "q=0.00", "q=0.000"}:
+            continue
+        if coding:
+            encodings.add(coding)
+    return encodings
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies larger than minimum_size with brotli (when it
+    is installed) or gzip, depending on the Accept-Encoding request header.
+    Compressed bodies are returned base64 encoded.
+    """
+
+    def __init__(
+        self,
+        app: EventHandler,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        excluded_types: tuple[str, ...] = UNCOMPRESSIBLE_TYPES,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.excluded_types = excluded_types
+
+    def __call__(self, event: Event, context: Context) -> HandlerResult:
+        get_scope(event, self)
+
+        result = self.app(event, context)
+        if "http" not in event or not result or "body" not in result:
+            return result
+
+        request_headers = event["http"].get("headers", {})
+        accept_encoding = get_header(request_headers, "accept-encoding")
+        if not accept_encoding:
+            return result
+
+        compress = self.select_encoding(parse_accept_encoding(accept_encoding))
+        if compress is None:
+            return result
+
+        return self.compress_result(result, *compress)
+
+    def select_encoding(
+        self, accepted: set[str]
+    ) -> Optional[tuple[str, Callable[[bytes], bytes]]]:
+        if brotli is not None and "br" in accepted:
+            return "br", lambda data: brotli.compress(data, quality=self.brotli_quality)
+
+        if "gzip" in accepted or "*" in accepted:
+            return "gzip", lambda data: gzip_compress(data, self.gzip_level)
+
+        return None
+
+    def compress_result(
+        self,
+        result: HandlerResult,
+        encoding: str,
+        compress: Callable[[bytes], bytes],
+    ) -> HandlerResult:
+        web_result = cast(WebResult, result)
+        headers: dict[str, HeaderValue] = dict(web_result.get("headers", {}))
+        if get_header(headers, "content-encoding") is not None:
+            return result
+
+        content_type = get_header(headers, "content-type") or ""
+        if content_type.startswith(self.excluded_types):
+            return result
+
+        body = web_result["body"]
+        if web_result.get("isBase64Encoded", False) and isinstance(body, str):
+            data = a2b_base64(body)
+        elif isinstance(body, str):
+            data = body.encode()
+        else:
+            return result
+
+        if len(data) < self.minimum_size:
+            return result
+
+        compressed = compress(data)
+        if len(compressed) >= len(data):
+            return result
+
+        vary = get_header(headers, "vary")
+        for key in list(headers):
+            if key.lower() in ("content-length", "vary"):
+                del headers[key]
+            elif key.lower() == "etag":
+                etag = headers[key]
+                if isinstance(etag, str) and etag.startswith('"'):
+                    # The compressed body is no longer byte-for-byte identical.
+                    headers[key] = "W/" + etag
+
+        if vary is None:
+            headers["vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower():
+            headers["vary"] = f"{vary}, Accept-Encoding"
+        else:
+            headers["vary"] = vary
+
+        headers["content-encoding"] = encoding
+        headers["content-length"] = str(len(compressed))
+
+        return {
+            **web_result,
+            "body": b2a_base64(compressed, newline=False).decode("ascii"),
+            "isBase64Encoded": True,
+            "headers": headers,
+        }
@@ -0,0 +1,118 @@
+from email.utils import parsedate_to_datetime
+from hashlib import blake2b
+from typing import Any, cast
+
+from starlette.exceptions import HTTPException
+
+from seastar import json
+from seastar.datastructures import Headers, get_header
+from seastar.middleware.exceptions import http_exception_handler
+from seastar.scope import get_request, get_scope, is_entry_point
+from seastar.types import (
+    Context,
+    Event,
+    EventHandler,
+    HandlerResult,
+    HeaderValue,
+    WebResult,
+)
+
+
+# Headers that are kept on a 304 response.
+NOT_MODIFIED_HEADERS = {
+    "cache-control",
+    "content-location",
+    "date",
+    "etag",
+    "expires",
+    "last-modified",
+    "vary",
+}
+
+
+def compute_etag(body: Any) -> str:
+    if isinstance(body, str):
+        data = body.encode()
+    elif isinstance(body, (bytes, bytearray, memoryview)):
+        data = bytes(body)
+    else:
+        data = json.dumps(body).encode()
+    return f'"{blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(
+    request_headers: Headers, response_headers: dict[str, HeaderValue]
+) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence and uses the weak comparison.
+        etag = get_header(response_headers, "etag")
+        if etag is None:
+            return False
+
+        if if_none_match.strip() == "*":
+            return True
+
+        etag = strip_weak(etag)
+        return any(strip_weak(tag.strip()) == etag for tag in if_none_match.split(","))
+
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = get_header(response_headers, "last-modified")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+            if_modified_since
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+class ConditionalGetMiddleware:
+    """
+    Sets an ETag on successful GET and HEAD results that do not have one and
+    answers with a bodiless 304 when the If-None-Match or If-Modified-Since
+    request headers show the client already has the current representation.
+    """
+
+    def __init__(self, app: EventHandler) -> None:
+        self.app = app
+
+    def __call__(self, event: Event, context: Context) -> HandlerResult:
+        get_scope(event, self)
+
+        result = self.app(event, context)
+        if "http" not in event or event["http"]["method"] not in {"GET", "HEAD"}:
+            return result
+
+        if not result or result.get("statusCode", 200) != 200 or "body" not in result:
+            return result
+
+        web_result = cast(WebResult, result)
+        headers: dict[str, HeaderValue] = dict(web_result.get("headers", {}))
+        if get_header(headers, "etag") is None:
+            headers["etag"] = compute_etag(web_result["body"])
+            result = {**web_result, "headers": headers}
+
+        request = get_request(event)
+        if not is_not_modified(request.headers, headers):
+            return result
+
+        exc = HTTPException(
+            status_code=304,
+            headers={
+                k: v if isinstance(v, str) else ", ".join(v)
+                for k, v in headers.items()
+                if k.lower() in NOT_MODIFIED_HEADERS
+            },
+        )
+        if is_entry_point(event, self):
+            response = http_exception_handler(request, exc)
+            return response()
+
+        raise exc
@@ -0,0 +1,169 @@
+from collections.abc import Sequence
+import re
+from typing import Any, Optional, cast
+
+from seastar.datastructures import get_header
+from seastar.scope import get_scope
+from seastar.types import (
+    Context,
+    Event,
+    EventHandler,
+    HandlerResult,
+    HeaderValue,
+    WebResult,
+)
+
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+SAFELISTED_HEADERS = {"accept", "accept-language", "content-language", "content-type"}
+
+
+class CORSMiddleware:
+    """
+    Adds the CORS headers to responses and answers preflight requests
+    directly, from headers computed when the middleware is created, without
+    building a Request or calling the app. The options are the same as
+    starlette's CORSMiddleware.
+    """
+
+    def __init__(
+        self,
+        app: EventHandler,
+        allow_origins: Sequence[str] = (),
+        allow_methods: Sequence[str] = ("GET",),
+        allow_headers: Sequence[str] = (),
+        allow_credentials: bool = False,
+        allow_origin_regex: Optional[str] = None,
+        expose_headers: Sequence[str] = (),
+        max_age: int = 600,
+    ) -> None:
+        if "*" in allow_methods:
+            allow_methods = ALL_METHODS
+
+        self.app = app
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_all_headers = "*" in allow_headers
+        self.allow_origins = frozenset(allow_origins)
+        self.allow_methods = frozenset(method.upper() for method in allow_methods)
+        self.allow_headers = frozenset(
+            SAFELISTED_HEADERS | {header.lower() for header in allow_headers}
+        )
+        self.allow_origin_regex = (
+            None if allow_origin_regex is None else re.compile(allow_origin_regex)
+        )
+        # an explicit origin has to be sent back when credentials are allowed.
+        self.echo_origin = not self.allow_all_origins or allow_credentials
+
+        simple_headers = {}
+        if self.allow_all_origins:
+            simple_headers["access-control-allow-origin"] = "*"
+        if allow_credentials:
+            simple_headers["access-control-allow-credentials"] = "true"
+        if expose_headers:
+            simple_headers["access-control-expose-headers"] = ", ".join(expose_headers)
+        self.simple_headers = tuple(simple_headers.items())
+
+        preflight_headers = {}
+        if self.allow_all_origins:
+            preflight_headers["access-control-allow-origin"] = "*"
+        preflight_headers["access-control-allow-methods"] = ", ".join(
+            sorted(self.allow_methods)
+        )
+        preflight_headers["access-control-max-age"] = str(max_age)
+        if self.allow_headers and not self.allow_all_headers:
+            preflight_headers["access-control-allow-headers"] = ", ".join(
+                sorted(self.allow_headers)
+            )
+        if allow_credentials:
+            preflight_headers["access-control-allow-credentials"] = "true"
+        self.preflight_headers = tuple(preflight_headers.items())
+
+    def __call__(self, event: Event, context: Context) -> HandlerResult:
+        get_scope(event, self)
+
+        if "http" not in event:
+            return self.app(event, context)
+
+        http = event["http"]
+        headers = http.get("headers", {})
+        origin = get_header(headers, "origin")
+        if origin is None:
+            return self.app(event, context)
+
+        request_method = get_header(headers, "access-control-request-method")
+        if http["method"] == "OPTIONS" and request_method is not None:
+            return self.preflight(origin, request_method, headers)
+
+        result = self.app(event, context)
+        if not result:
+            return result
+        return self.add_headers(result, origin)
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        if self.allow_all_origins:
+            return True
+        if self.allow_origin_regex is not None and self.allow_origin_regex.fullmatch(
+            origin
+        ):
+            return True
+        return origin in self.allow_origins
+
+    def preflight(
+        self, origin: str, request_method: str, request_headers: dict[str, Any]
+    ) -> HandlerResult:
+        headers: dict[str, HeaderValue] = dict(self.preflight_headers)
+        failures = []
+
+        if self.is_allowed_origin(origin):
+            if self.echo_origin:
+                headers["access-control-allow-origin"] = origin
+                headers["vary"] = "Origin"
+        else:
+            failures.append("origin")
+
+        if request_method.upper() not in self.allow_methods:
+            failures.append("method")
+
+        requested_headers = get_header(
+            request_headers, "access-control-request-headers"
+        )
+        if self.allow_all_headers and requested_headers is not None:
+            headers["access-control-allow-headers"] = requested_headers
+        elif requested_headers is not None:
+            for header in requested_headers.split(","):
+                if header.strip().lower() not in self.allow_headers:
+                    failures.append("headers")
+                    break
+
+        result: WebResult
+        if failures:
+            headers["content-type"] = "text/plain; charset=utf-8"
+            result = {
+                "statusCode": 400,
+                "body": "Disallowed CORS " + ", ".join(failures),
+                "headers": headers,
+            }
+        else:
+            result = {"statusCode": 200, "body": "OK", "headers": headers}
+        return result
+
+    def add_headers(self, result: HandlerResult, origin: str) -> HandlerResult:
+        web_result = cast(WebResult, result)
+        headers: dict[str, HeaderValue] = dict(web_result.get("headers", {}))
+        headers.update(self.simple_headers)
+
+        if self.echo_origin and self.is_allowed_origin(origin):
+            headers["access-control-allow-origin"] = origin
+            vary = get_header(headers, "vary")
+            if vary is None:
+                headers["vary"] = "Origin"
+            elif "origin" not in vary.lower():
+                for key in list(headers):
+                    if key.lower() == "vary":
+                        del headers[key]
+                headers["vary"] = f"{vary}, Origin"
+        elif self.echo_origin:
+            # the origin is not allowed, the browser will block the response.
+            headers.pop("access-control-allow-origin", None)
+
+        return {**web_result, "headers": headers}
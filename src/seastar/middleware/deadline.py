@@ -0,0 +1,104 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import contextvars
+from http import HTTPStatus
+import logging
+import threading
+import time
+from typing import Optional
+
+from starlette.exceptions import HTTPException
+
+from seastar.responses import PlainTextResponse
+from seastar.scope import get_scope, is_entry_point
+from seastar.types import Context, Event, EventHandler, HandlerResult
+
+
+logger = logging.getLogger("seastar")
+
+
+class DeadlineMiddleware:
+    """
+    Runs the app with a time budget equal to the remaining time of the
+    invocation minus a safety margin. If the budget runs out a 503 with a
+    Retry-After header is returned before the platform kills the function.
+
+    The app runs in a worker thread so that it can be abandoned, a thread
+    cannot be interrupted so it keeps running in the background until it
+    finishes or the container is frozen. When every worker is still busy
+    with an abandoned app, the app runs in the invocation's thread without a
+    deadline rather than waiting in the queue for a worker.
+    """
+
+    def __init__(
+        self,
+        app: EventHandler,
+        margin_ms: int = 500,
+        status_code: int = 503,
+        retry_after: int = 1,
+        max_workers: int = 4,
+    ) -> None:
+        self.app = app
+        self.margin_ms = margin_ms
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._running = 0
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="seastar-deadline"
+            )
+        return self._executor
+
+    def __call__(self, event: Event, context: Context) -> HandlerResult:
+        scope = get_scope(event, self)
+
+        get_remaining_time = getattr(context, "get_remaining_time_in_millis", None)
+        if get_remaining_time is None:
+            return self.app(event, context)
+
+        budget_ms = get_remaining_time() - self.margin_ms
+        scope["deadline"] = time.time() * 1000 + budget_ms
+        if budget_ms <= 0:
+            return self.timeout(event)
+
+        with self._lock:
+            saturated = self._running >= self.max_workers
+            if not saturated:
+                self._running += 1
+        if saturated:
+            logger.warning(
+                "All %d deadline workers are busy, running without a deadline",
+                self.max_workers,
+            )
+            return self.app(event, context)
+
+        ctx = contextvars.copy_context()
+        future = self.executor.submit(ctx.run, self.run, event, context)
+        try:
+            return future.result(timeout=budget_ms / 1000)
+        except TimeoutError:
+            return self.timeout(event)
+
+    def run(self, event: Event, context: Context) -> HandlerResult:
+        try:
+            return self.app(event, context)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def timeout(self, event: Event) -> HandlerResult:
+        headers = {"Retry-After": str(self.retry_after)}
+        if is_entry_point(event, self) or "http" not in event:
+            response = PlainTextResponse(
+                HTTPStatus(self.status_code).phrase,
+                status_code=self.status_code,
+                headers=headers,
+            )
+            return response()
+
+        raise HTTPException(status_code=self.status_code, headers=headers)
@@ -1,18 +1,12 @@
 import html
 import inspect
+from time import perf_counter_ns
 import traceback
 from typing import Optional
 
-from starlette.middleware.errors import (
-    CENTER_LINE,
-    FRAME_TEMPLATE,
-    JS,
-    LINE,
-    STYLES,
-    TEMPLATE,
-)
-
-from seastar.responses import HTMLResponse, PlainTextResponse
+from seastar.responses import HTMLResponse, PlainTextResponse, copy_result
+from seastar.scope import get_scope
+from seastar.timing import get_timings
 from seastar.types import (
     Context,
     Event,
@@ -34,27 +28,37 @@ class ServerErrorMiddleware:
         self.handler = handler
 
     def __call__(self, event: Event, context: Context) -> None:
-        _ = event.setdefault("__seastar", {}).setdefault("entry_point", self) is self
+        get_scope(event, self)
 
         try:
             return self.app(event, context)
 
         except Exception as exc:
+            timings = get_timings()
+            if timings is not None:
+                start = perf_counter_ns()
+
             if self.debug:
-                return debug_exception_handler(event, context, exc)
+                result = debug_exception_handler(event, context, exc)
 
             elif self.handler is not None:
-                return self.handler(event, context, exc)
+                result = self.handler(event, context, exc)
 
             else:
-                return default_exception_handler(event, context, exc)
+                result = default_exception_handler(event, context, exc)
+
+            if timings is not None:
+                timings.add("server_error", start)
+            return result
+
+
+SERVER_ERROR_RESULT = PlainTextResponse("Internal Server Error", status_code=500)()
 
 
 def default_exception_handler(
     event: Event, context: Context, exc: Exception
 ) -> HandlerResult:
-    response = PlainTextResponse("Internal Server Error", status_code=500)
-    return response()
+    return copy_result(SERVER_ERROR_RESULT)
 
 
 def debug_exception_handler(
@@ -64,7 +68,7 @@ def debug_exception_handler(
 
     if "text/html" in accept:
         content = generate_html(exc)
-        return HTMLResponse(content, status_code=500)
+        return HTMLResponse(content, status_code=500)()
 
     content = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
     response = PlainTextResponse(content=content, status_code=500)
@@ -72,6 +76,9 @@ def debug_exception_handler(
 
 
 def generate_html(exc: Exception, limit: int = 7) -> str:
+    # The debug templates are only needed once something has gone wrong.
+    from starlette.middleware.errors import JS, STYLES, TEMPLATE
+
     traceback_obj = traceback.TracebackException.from_exception(
         exc, capture_locals=True
     )
@@ -95,6 +102,8 @@ def generate_html(exc: Exception, limit: int = 7) -> str:
 
 
 def generate_frame_html(frame: inspect.FrameInfo, is_collapsed: bool) -> str:
+    from starlette.middleware.errors import FRAME_TEMPLATE
+
     code_context = "".join(
         format_line(index, line, frame.lineno, frame.index)  # type: ignore[arg-type]
         for index, line in enumerate(frame.code_context or [])
@@ -116,6 +125,8 @@ def generate_frame_html(frame: inspect.FrameInfo, is_collapsed: bool) -> str:
 
 
 def format_line(index: int, line: str, frame_lineno: int, frame_index: int) -> str:
+    from starlette.middleware.errors import CENTER_LINE, LINE
+
     values = {
         # HTML escape - line could contain < or >
         "line": html.escape(line).replace(" ", "&nbsp"),
@@ -1,18 +1,25 @@
 from collections.abc import Mapping
+import inspect
+from time import perf_counter_ns
 from typing import Callable, Optional, Union
 
-from starlette._exception_handler import _lookup_exception_handler
 from starlette.exceptions import HTTPException
 
+from seastar.concurrency import run_until_complete
+from seastar.exceptions import PrecomputedHTTPException
 from seastar.requests import Request
-from seastar.responses import Response, PlainTextResponse
+from seastar.responses import JSONResponse, Response, PlainTextResponse, copy_result
+from seastar.scope import get_request, get_scope
+from seastar.timing import get_timings
 from seastar.types import (
+    AnyWebExceptionHandler,
     Context,
     Event,
     HandlerResult,
     WebExceptionHandler,
     EventHandler,
 )
+from seastar.validation import ValidationError
 
 
 class ExceptionMiddleware:
@@ -24,46 +31,88 @@ class ExceptionMiddleware:
         ] = None,
     ) -> None:
         self.app = app
-        self._status_handlers: Mapping[int, WebExceptionHandler] = {}
-        self._exception_handlers: Mapping[type[Exception], WebExceptionHandler] = {
-            HTTPException: http_exception_handler
+        self._status_handlers: dict[int, AnyWebExceptionHandler] = {}
+        self._exception_handlers: dict[type[Exception], AnyWebExceptionHandler] = {
+            HTTPException: http_exception_handler,
+            ValidationError: validation_exception_handler,
         }
+        self._handler_cache: dict[
+            type[Exception], Optional[AnyWebExceptionHandler]
+        ] = {}
 
         if handlers is not None:
             for key, value in handlers.items():
                 self.add_exception_handler(key, value)
 
     def __call__(self, event: Event, context: Context) -> HandlerResult:
-        _ = event.setdefault("__seastar", {}).setdefault("entry_point", self) is self
+        get_scope(event, self)
 
         try:
             return self.app(event, context)
 
         except Exception as exc:
-            handler = self.lookup_handler(exc)
-            if handler is None:
-                raise exc
-
-            request = Request(event)
-            response = handler(request, exc)
-            return response()
+            return self.handle(event, exc)
 
     __code__ = __call__.__code__
 
+    def handle(self, event: Event, exc: Exception) -> HandlerResult:
+        """
+        Return the result of the handler registered for exc, or raise it again
+        when there is none.
+        """
+        handler = self.lookup_handler(exc)
+        if handler is None:
+            raise exc
+        if handler is http_exception_handler and isinstance(
+            exc, PrecomputedHTTPException
+        ):
+            return copy_result(exc.result)
+
+        timings = get_timings()
+        if timings is not None:
+            start = perf_counter_ns()
+
+        request = get_request(event)
+        response = handler(request, exc)
+        if inspect.isawaitable(response):
+            response = run_until_complete(response)
+        result = response()
+
+        if timings is not None:
+            timings.add("exception_handler", start)
+        return result
+
     def add_exception_handler(
-        self, key: Union[int, type[Exception]], handler: WebExceptionHandler
+        self,
+        key: Union[int, type[Exception]],
+        handler: AnyWebExceptionHandler,
     ) -> None:
         if isinstance(key, int):
             self._status_handlers[key] = handler
         else:
             self._exception_handlers[key] = handler
+        self._handler_cache.clear()
 
-    def lookup_handler(self, exc: Exception) -> Optional[WebExceptionHandler]:
+    def lookup_handler(self, exc: Exception) -> Optional[AnyWebExceptionHandler]:
         if isinstance(exc, HTTPException):
-            if exc.status_code in self._status_handlers:
-                return self._status_handlers[exc.status_code]
+            handler = self._status_handlers.get(exc.status_code)
+            if handler is not None:
+                return handler
 
-        return _lookup_exception_handler(self._exception_handlers, exc)
+        cls = type(exc)
+        try:
+            return self._handler_cache[cls]
+        except KeyError:
+            pass
+
+        # Resolved once per exception type, the closest class in the MRO wins.
+        handler = None
+        for base in cls.__mro__:
+            if base in self._exception_handlers:
+                handler = self._exception_handlers[base]
+                break
+        self._handler_cache[cls] = handler
+        return handler
 
     def exception_handler(
         self, key: Union[int, type[Exception]]
@@ -83,3 +132,8 @@ def http_exception_handler(request: Request, exc: Exception) -> Response:
     return PlainTextResponse(
         exc.detail, status_code=exc.status_code, headers=exc.headers
     )
+
+
+def validation_exception_handler(request: Request, exc: Exception) -> Response:
+    assert isinstance(exc, ValidationError)
+    return JSONResponse({"detail": exc.errors}, status_code=exc.status_code)
@@ -0,0 +1,81 @@
+import atexit
+import inspect
+import logging
+import threading
+import time
+from collections.abc import Sequence
+from typing import Optional
+
+from seastar.concurrency import run_until_complete
+from seastar.datastructures import State
+from seastar.scope import get_scope
+from seastar.types import Context, Event, EventHandler, HandlerResult, LifespanHook
+
+
+logger = logging.getLogger("seastar")
+
+
+class Lifespan:
+    """
+    Runs the startup hooks once per warm container, on the first invocation,
+    and the shutdown hooks when the process exits. Hooks receive the State,
+    which is shared by every invocation and exposed as Request.state.
+    """
+
+    def __init__(
+        self,
+        on_startup: Optional[Sequence[LifespanHook]] = None,
+        on_shutdown: Optional[Sequence[LifespanHook]] = None,
+        state: Optional[State] = None,
+    ) -> None:
+        self.on_startup = [] if on_startup is None else list(on_startup)
+        self.on_shutdown = [] if on_shutdown is None else list(on_shutdown)
+        self.state = State() if state is None else state
+        self.started = False
+        self.startup_duration: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def startup(self) -> None:
+        with self._lock:
+            if self.started:
+                return
+
+            start = time.perf_counter()
+            for hook in self.on_startup:
+                self.run_hook(hook)
+
+            self.startup_duration = time.perf_counter() - start
+            self.started = True
+
+        atexit.register(self.shutdown)
+        logger.info("Startup completed in %.2fms", self.startup_duration * 1000)
+
+    def shutdown(self) -> None:
+        for hook in self.on_shutdown:
+            self.run_hook(hook)
+
+    def run_hook(self, hook: LifespanHook) -> None:
+        result = hook(self.state)
+        if inspect.isawaitable(result):
+            # async hooks share the event loop used by async handlers.
+            run_until_complete(result)
+
+
+class LifespanMiddleware(Lifespan):
+    def __init__(
+        self,
+        app: EventHandler,
+        on_startup: Optional[Sequence[LifespanHook]] = None,
+        on_shutdown: Optional[Sequence[LifespanHook]] = None,
+        state: Optional[State] = None,
+    ) -> None:
+        super().__init__(on_startup=on_startup, on_shutdown=on_shutdown, state=state)
+        self.app = app
+
+    def __call__(self, event: Event, context: Context) -> HandlerResult:
+        scope = get_scope(event, self)
+        if not self.started:
+            self.startup()
+
+        scope["state"] = self.state
+        return self.app(event, context)
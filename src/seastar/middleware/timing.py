@@ -0,0 +1,54 @@
+import logging
+from time import perf_counter_ns
+
+from seastar import json
+from seastar.scope import get_scope
+from seastar.timing import _current_timings, Timings
+from seastar.types import Context, Event, EventHandler, HandlerResult
+
+
+logger = logging.getLogger("seastar")
+
+
+class TimingMiddleware:
+    """
+    Times the phases of each invocation and reports them in a Server-Timing
+    response header and/or as a JSON log line on the 'seastar' logger.
+    Timing is only done below this middleware, without it the instrumented
+    code only pays for a context variable lookup.
+    """
+
+    def __init__(
+        self, app: EventHandler, header: bool = True, log: bool = False
+    ) -> None:
+        self.app = app
+        self.header = header
+        self.log = log
+
+    def __call__(self, event: Event, context: Context) -> HandlerResult:
+        get_scope(event, self)
+
+        timings = Timings()
+        token = _current_timings.set(timings)
+        try:
+            result = self.app(event, context)
+        finally:
+            _current_timings.reset(token)
+            timings.add("total", timings.start_ns, perf_counter_ns())
+
+        if self.log:
+            http = event.get("http", {})
+            record = {
+                "method": http.get("method"),
+                "path": http.get("path"),
+                "status": result.get("statusCode") if result else None,
+                "timings": timings.as_dict(),
+            }
+            logger.info(json.dumps(record))
+
+        if self.header and result and "http" in event:
+            headers = dict(result.get("headers", {}))  # type: ignore[arg-type]
+            headers["server-timing"] = timings.server_timing()
+            result = {**result, "headers": headers}  # type: ignore
+
+        return result
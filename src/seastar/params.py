@@ -0,0 +1,345 @@
+"""
+Injection of handler arguments from the request.
+
+The signature of an endpoint is inspected once, when its route is created,
+and turned into a list of getters, one per parameter, that take the Request
+and return the converted value. Parameters are resolved as follows:
+
+- annotated with Request, or named 'request' without an annotation: the Request.
+  An endpoint with a single unannotated parameter, or one whose annotation
+  cannot be resolved, is called with the Request.
+- named like a path parameter: the path parameter.
+- a Query(), Header() or Body() default: that part of the request.
+- annotated with str, int, float, bool, an Enum, an Optional or a list of
+  these, or not annotated: the query parameter of the same name.
+- anything else, ex. dict or list[dict]: the JSON body.
+
+Without raw http the event has no queryString or body, the platform merges
+the query and JSON body values into the event. Query and body parameters are
+then read by name from Request.parameters.
+
+A missing required value or one that cannot be converted raises a
+ValidationError, a 422. A body parameter annotated with a dataclass, a
+TypedDict or a generic, ex. list[Item], is validated with seastar.validation.
+"""
+from enum import Enum
+import inspect
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from seastar.requests import Request
+from seastar.validation import ValidationError, compile_schema
+
+
+Getter = Callable[[Request], Any]
+Injector = Callable[[Request], dict[str, Any]]
+
+_empty = inspect.Parameter.empty
+
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off"}
+
+
+class Param:
+    source = ""
+
+    def __init__(self, default: Any = _empty, *, alias: Optional[str] = None) -> None:
+        self.default = default
+        self.alias = alias
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(default={self.default!r})"
+
+
+class Query(Param):
+    source = "query"
+
+
+class Header(Param):
+    source = "header"
+
+
+class Body(Param):
+    source = "body"
+
+
+def invalid(source: str, name: Optional[str], msg: str) -> ValidationError:
+    loc = [source] if name is None else [source, name]
+    return ValidationError([{"loc": loc, "msg": msg}])
+
+
+def type_name(annotation: Any) -> str:
+    annotation = unwrap_optional(annotation)
+    return getattr(annotation, "__name__", str(annotation))
+
+
+def parse_bool(value: str) -> bool:
+    value = value.lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    raise ValueError(value)
+
+
+def as_text(value: Any) -> str:
+    """
+    Return a value of Request.parameters as the string a query would hold,
+    the platform has already decoded JSON numbers and booleans.
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return str(value)
+    raise ValueError(value)
+
+
+def parameter(request: Request, name: str) -> Any:
+    parameters = request.parameters
+    if isinstance(parameters, dict):
+        return parameters.get(name)
+    # validated with a parameters_schema, ex. a dataclass.
+    return getattr(parameters, name, None)
+
+
+def unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def compile_converter(annotation: Any) -> Optional[Callable[[str], Any]]:
+    """
+    Return a function converting a string to the annotated type, or None if
+    the type cannot be built from a string.
+    """
+    annotation = unwrap_optional(annotation)
+    if annotation in (_empty, Any, str):
+        return str
+    if annotation is bool:
+        return parse_bool
+    if annotation in (int, float):
+        return annotation  # type: ignore[no-any-return]
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return annotation
+    return None
+
+
+def is_multiple(annotation: Any) -> bool:
+    return get_origin(unwrap_optional(annotation)) in (list, tuple, set)
+
+
+def compile_scalar_getter(
+    name: str,
+    source: str,
+    annotation: Any,
+    default: Any,
+    lookup: Callable[[Request], Any],
+) -> Getter:
+    convert = compile_converter(annotation)
+    if convert is None:
+        raise TypeError(f"Cannot convert {source} parameter '{name}' to {annotation}")
+
+    def getter(request: Request) -> Any:
+        value = lookup(request)
+        if value is None:
+            if default is _empty:
+                raise invalid(source, name, "field required")
+            return default
+
+        try:
+            return convert(as_text(value))
+        except ValueError:
+            raise invalid(source, name, f"expected {type_name(annotation)}")
+
+    return getter
+
+
+def compile_query_getter(name: str, annotation: Any, default: Any) -> Getter:
+    if not is_multiple(annotation):
+
+        def lookup(request: Request) -> Any:
+            if "queryString" not in request.event["http"]:
+                return parameter(request, name)
+            return request.query_params.get(name)
+
+        return compile_scalar_getter(name, "query", annotation, default, lookup)
+
+    container = get_origin(unwrap_optional(annotation))
+    item_type = (get_args(unwrap_optional(annotation)) or (str,))[0]
+    convert = compile_converter(item_type)
+    if convert is None:
+        raise TypeError(f"Cannot convert query parameter '{name}' to {annotation}")
+
+    def getter(request: Request) -> Any:
+        if "queryString" in request.event["http"]:
+            values: list[Any] = request.query_params.getlist(name)
+        else:
+            value = parameter(request, name)
+            values = [] if value is None else value
+            if not isinstance(values, list):
+                values = [values]
+        if not values:
+            if default is _empty:
+                raise invalid("query", name, "field required")
+            return default
+
+        try:
+            return container(convert(as_text(value)) for value in values)
+        except ValueError:
+            raise invalid("query", name, f"expected {type_name(item_type)}")
+
+    return getter
+
+
+def compile_path_getter(name: str, annotation: Any) -> Getter:
+    convert = compile_converter(annotation)
+    if convert is str or convert is None:
+        # the path convertor has already done the conversion.
+        return lambda request: request.path_params[name]
+
+    def getter(request: Request) -> Any:
+        value = request.path_params[name]
+        if not isinstance(value, str):
+            return value
+        try:
+            return convert(value)
+        except ValueError:
+            raise invalid("path", name, f"expected {type_name(annotation)}")
+
+    return getter
+
+
+def compile_body_getter(name: str, annotation: Any, default: Any) -> Getter:
+    validate = None
+    if annotation not in (_empty, Any):
+        validate = compile_schema(annotation, "body")
+
+    def getter(request: Request) -> Any:
+        if "body" not in request.event["http"]:
+            data = parameter(request, name)
+            if data is None:
+                if default is _empty:
+                    raise invalid("body", name, "field required")
+                return default
+            return data if validate is None else validate(data)
+
+        if not request.event["http"]["body"]:
+            if default is _empty:
+                raise invalid("body", None, "field required")
+            return default
+
+        data = request.json()
+        if validate is None or request.body_validator is not None:
+            return data
+        return validate(data)
+
+    return getter
+
+
+def compile_getter(
+    parameter: inspect.Parameter, annotation: Any, path_params: set[str]
+) -> Getter:
+    name = parameter.name
+    default = parameter.default
+
+    if isinstance(default, Param):
+        alias = default.alias or name
+        if isinstance(default, Header):
+            alias = (default.alias or name.replace("_", "-")).lower()
+            return compile_scalar_getter(
+                alias,
+                "header",
+                annotation,
+                default.default,
+                lambda r: r.headers.get(alias),
+            )
+        if isinstance(default, Body):
+            return compile_body_getter(alias, annotation, default.default)
+        return compile_query_getter(alias, annotation, default.default)
+
+    if name in path_params:
+        return compile_path_getter(name, annotation)
+
+    if is_multiple(annotation):
+        item_type = (get_args(unwrap_optional(annotation)) or (str,))[0]
+        if compile_converter(item_type) is not None:
+            return compile_query_getter(name, annotation, default)
+        return compile_body_getter(name, annotation, default)
+
+    if compile_converter(annotation) is not None:
+        return compile_query_getter(name, annotation, default)
+
+    return compile_body_getter(name, annotation, default)
+
+
+def is_request_parameter(parameter: inspect.Parameter, annotation: Any) -> bool:
+    if isinstance(annotation, type) and issubclass(annotation, Request):
+        return True
+    if isinstance(annotation, str):
+        # not resolved, ex. Request is only imported when TYPE_CHECKING.
+        return annotation.rpartition(".")[2] == "Request"
+    return annotation is _empty and parameter.name == "request"
+
+
+def compile_injector(
+    endpoint: Callable[..., Any], path_params: Optional[set[str]] = None
+) -> Optional[Injector]:
+    """
+    Return a function building the keyword arguments of the endpoint from a
+    Request, or None if the endpoint only takes the request positionally.
+    """
+    signature = inspect.signature(endpoint)
+    try:
+        hints = get_type_hints(endpoint)
+    except Exception:
+        hints = {}
+
+    parameters = list(signature.parameters.values())
+    if len(parameters) == 1:
+        parameter = parameters[0]
+        annotation = hints.get(parameter.name, parameter.annotation)
+        # handlers written as 'def handler(req)' keep receiving the request, as
+        # do those whose annotation could not be resolved.
+        if (
+            parameter.kind
+            in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD)
+            and parameter.default is _empty
+            and parameter.name not in (path_params or ())
+            and (
+                annotation is _empty
+                or isinstance(annotation, str)
+                or is_request_parameter(parameter, annotation)
+            )
+        ):
+            return None
+
+    getters: list[tuple[str, Getter]] = []
+    for parameter in parameters:
+        if parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            continue
+        if parameter.kind == parameter.POSITIONAL_ONLY:
+            raise TypeError(
+                f"Positional only parameter '{parameter.name}' cannot be injected"
+            )
+
+        annotation = hints.get(parameter.name, parameter.annotation)
+        if is_request_parameter(parameter, annotation):
+            getters.append((parameter.name, lambda request: request))
+        else:
+            getter = compile_getter(parameter, annotation, path_params or set())
+            getters.append((parameter.name, getter))
+
+    def injector(request: Request) -> dict[str, Any]:
+        return {name: getter(request) for name, getter in getters}
+
+    return injector
@@ -1,78 +1,270 @@
-from base64 import b64decode
-from functools import cached_property
-import json
-from typing import Any, Optional
+from binascii import a2b_base64, Error as BinasciiError
+from contextlib import AbstractContextManager, nullcontext
+from functools import partial
+import time
+from typing import Any, Callable, Iterable, Optional, TypeVar, TYPE_CHECKING
 from urllib.parse import parse_qsl
 
-from starlette.datastructures import FormData, Headers, QueryParams
 from starlette.exceptions import HTTPException
-from starlette.requests import cookie_parser
 
+from seastar import json
+from seastar.concurrency import run_parallel
+from seastar.datastructures import Headers, QueryParams, State
 from seastar.exceptions import WebEventException
+from seastar.timing import get_timings, Timings
 from seastar.types import Event
 
 
+if TYPE_CHECKING:
+    from starlette.datastructures import FormData
+
+
+T = TypeVar("T")
+
+
+# Marks the lazily computed attributes that have not been computed yet.
+_unset: Any = object()
+
+
 class Request:
-    def __init__(self, event: Event):
+    """
+    A view of a web event. Everything is read from the event when it is first
+    accessed and the instance has no __dict__, so creating one is cheap.
+    """
+
+    __slots__ = (
+        "event",
+        "max_body_size",
+        "body_validator",
+        "parameters_validator",
+        "_headers",
+        "_query_params",
+        "_cookies",
+        "_body_bytes",
+        "_body",
+        "_parameters",
+    )
+
+    def __init__(self, event: Event, *, max_body_size: Optional[int] = None):
         if "http" not in event:
             raise WebEventException("The event was expected to be a web event.")
         self.event = event
+        self.max_body_size = max_body_size
+        # compiled schemas that json() and parameters are validated with.
+        self.body_validator: Optional[Callable[[Any], Any]] = None
+        self.parameters_validator: Optional[Callable[[Any], Any]] = None
+        self._headers: Optional[Headers] = None
+        self._query_params: Optional[QueryParams] = None
+        self._cookies: Optional[dict[str, str]] = _unset
+        self._body_bytes: Optional[bytes] = None
+        self._body: Optional[str] = None
+        self._parameters: Any = _unset
 
-    @cached_property
+    @property
     def method(self) -> str:
         return self.event["http"]["method"]
 
-    @cached_property
+    @property
     def path(self) -> str:
         return self.event["http"]["path"]
 
-    @cached_property
+    @property
     def path_params(self) -> dict[str, str]:
         return self.event["http"].get("path_params", {})
 
-    @cached_property
+    @property
     def query_params(self) -> QueryParams:
-        if "queryString" not in self.event["http"]:
-            raise WebEventException("Must activate raw http to use query_params.")
-
-        return QueryParams(self.event["http"]["queryString"])
+        if self._query_params is None:
+            if "queryString" not in self.event["http"]:
+                raise WebEventException("Must activate raw http to use query_params.")
+            self._query_params = QueryParams(self.event["http"]["queryString"])
+        return self._query_params
 
-    @cached_property
+    @property
     def headers(self) -> Headers:
-        return Headers(self.event["http"]["headers"])
+        if self._headers is None:
+            self._headers = Headers(self.event["http"]["headers"])
+        return self._headers
 
-    @cached_property
+    @property
     def cookies(self) -> Optional[dict[str, str]]:
-        if "cookie" in self.headers:
-            return cookie_parser(self.headers["cookie"])
-        return None
+        if self._cookies is _unset:
+            cookie = self.headers.get("cookie")
+            if cookie is None:
+                self._cookies = None
+            else:
+                # deferred, starlette.requests imports the multipart form parsers.
+                from starlette.requests import cookie_parser
 
-    @cached_property
-    def body(self) -> str:
+                self._cookies = cookie_parser(cookie)
+        return self._cookies
+
+    @property
+    def is_base64_encoded(self) -> bool:
+        return self.event["http"].get("isBase64Encoded", False)
+
+    def _raw_body(self) -> str:
+        """
+        Return the body as it appears in the event, raising a 413 if it
+        is larger than max_body_size. The size is checked without decoding.
+        """
         if "body" not in self.event["http"]:
             raise WebEventException("Must activate raw http to use body.")
 
         body = self.event["http"]["body"]
-        if self.event["http"].get("isBase64Encoded", False):
-            body = b64decode(body).decode()
+        if self.max_body_size is not None:
+            if self._body_size(body) > self.max_body_size:
+                raise HTTPException(413)
+
         return body
 
-    @cached_property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            k: v
-            for k, v in self.event.items()
-            if not k.startswith("__") and k != "http"
-        }
+    def _body_size(self, body: str) -> int:
+        if self.is_base64_encoded:
+            return len(body) * 3 // 4 - body[-2:].count("=")
+        # a lower bound, the utf-8 encoded size can only be larger.
+        return len(body)
+
+    @property
+    def body_bytes(self) -> bytes:
+        if self._body_bytes is not None:
+            return self._body_bytes
+
+        body = self._raw_body()
+        if self.is_base64_encoded:
+            try:
+                self._body_bytes = a2b_base64(body)
+            except BinasciiError:
+                raise HTTPException(400)
+            return self._body_bytes
+
+        body_bytes = body.encode()
+        if self.max_body_size is not None and len(body_bytes) > self.max_body_size:
+            raise HTTPException(413)
+        self._body_bytes = body_bytes
+        return body_bytes
+
+    @property
+    def body(self) -> str:
+        if self._body is None:
+            if self.is_base64_encoded:
+                self._body = self.body_bytes.decode()
+            else:
+                self._body = self._raw_body()
+        return self._body
+
+    @property
+    def state(self) -> State:
+        seastar = self.event.setdefault("__seastar", {})
+        state: State = seastar.setdefault("state", State())
+        return state
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """
+        The time, in milliseconds since the epoch, by which the handler
+        should be done. Set by DeadlineMiddleware.
+        """
+        return self.event.get("__seastar", {}).get("deadline")
+
+    @property
+    def remaining_ms(self) -> Optional[int]:
+        if self.deadline is None:
+            return None
+        return max(int(self.deadline - time.time() * 1000), 0)
+
+    @property
+    def timings(self) -> Optional[Timings]:
+        return get_timings()
+
+    def span(self, name: str) -> AbstractContextManager[None]:
+        """
+        Time a block of code, ex: `with request.span("db"): ...`.
+        Does nothing unless timing is enabled by TimingMiddleware.
+        """
+        timings = get_timings()
+        if timings is None:
+            return nullcontext()
+        return timings.span(name)
+
+    @property
+    def parameters(self) -> Any:
+        if self._parameters is _unset:
+            parameters = {
+                k: v
+                for k, v in self.event.items()
+                if not k.startswith("__") and k != "http"
+            }
+            if self.parameters_validator is not None:
+                parameters = self.parameters_validator(parameters)
+            self._parameters = parameters
+        return self._parameters
 
     def json(self) -> Any:
         if self.headers.get("content-type") != "application/json":
             raise HTTPException(415)
 
+        # avoid decoding a base64 body to str, the backends accept bytes.
+        body = self.body_bytes if self.is_base64_encoded else self.body
         try:
-            return json.loads(self.body)
-        except json.JSONDecodeError:
+            data = json.loads(body)
+        except ValueError:
             raise HTTPException(400)
 
-    def form(self) -> FormData:
-        return FormData(parse_qsl(self.body))
+        if self.body_validator is not None:
+            return self.body_validator(data)
+        return data
+
+    def run_parallel(self, *funcs: Callable[[], T]) -> list[T]:
+        """
+        Run blocking functions in the shared thread pool and return their
+        results in order. If the invocation has a deadline, outstanding work
+        is cancelled when it is reached and a 503 is raised.
+        """
+        timeout = None
+        if self.remaining_ms is not None:
+            timeout = self.remaining_ms / 1000
+
+        try:
+            return run_parallel(funcs, timeout=timeout)
+        except TimeoutError:
+            raise HTTPException(503, headers={"Retry-After": "1"})
+
+    def map(self, func: Callable[..., T], *iterables: Iterable[Any]) -> list[T]:
+        return self.run_parallel(*(partial(func, *args) for args in zip(*iterables)))
+
+    def form(
+        self,
+        *,
+        max_size: Optional[int] = None,
+        max_part_size: Optional[int] = None,
+        max_parts: int = 1000,
+    ) -> "FormData":
+        """
+        Parse a urlencoded or multipart/form-data body. Files are UploadFile
+        objects that share the memory of the body. A body larger than
+        max_size, a part larger than max_part_size or more than max_parts
+        parts is a 413.
+        """
+        from starlette.datastructures import FormData
+
+        from seastar.formparsers import MultiPartParser, parse_options_header
+
+        content_type, options = parse_options_header(
+            self.headers.get("content-type", "")
+        )
+        if max_size is not None and self._body_size(self._raw_body()) > max_size:
+            raise HTTPException(413)
+
+        if content_type != "multipart/form-data":
+            return FormData(parse_qsl(self.body))
+
+        if "boundary" not in options:
+            raise HTTPException(400, "Missing multipart boundary")
+
+        parser = MultiPartParser(
+            self.body_bytes,
+            options["boundary"],
+            max_part_size=max_part_size,
+            max_parts=max_parts,
+        )
+        return FormData(list(parser.parse()))  # type: ignore[arg-type]
@@ -1,14 +1,29 @@
+from binascii import b2a_base64
 from collections.abc import Mapping
-import json
-from typing import Any, Optional
+from datetime import datetime
+from hashlib import blake2b
+import mimetypes
+from time import perf_counter_ns
+from typing import Any, Literal, NamedTuple, Optional, Union, cast
 
-from starlette import responses
+from seastar import json
+from seastar.timing import get_timings
+from seastar.types import HandlerResult, HeaderValue, WebResult
 
-from seastar.json import JsonEncoder
-from seastar.types import HandlerResult
 
+class Response:
+    """
+    The result of a web handler. Headers are kept as a dict of lowercase
+    names to str values, or to a list of values when a header is repeated,
+    ex. several Set-Cookie headers, which is how Digital Ocean expects them.
+    Calling the response returns the result of the function.
+    """
+
+    __slots__ = ("status_code", "body", "headers")
+
+    media_type: Optional[str] = None
+    charset = "utf-8"
 
-class Response(responses.Response):
     def __init__(
         self,
         content: Any = None,
@@ -16,48 +31,232 @@ class Response(responses.Response):
         headers: Optional[Mapping[str, str]] = None,
         media_type: Optional[str] = None,
     ) -> None:
+        self.status_code = status_code
+        self.body = self.render(content)
+        self.init_headers(headers, media_type)
+
+    def render(self, content: Any) -> Any:
+        return content
+
+    def init_headers(
+        self,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+    ) -> None:
+        self.headers: dict[str, HeaderValue] = {}
+        if headers is not None:
+            for key, value in headers.items():
+                self.headers[key.lower()] = value
+
+        body = self.body
+        if (
+            "content-length" not in self.headers
+            and not (self.status_code < 200 or self.status_code in (204, 304))
+        ):
+            if isinstance(body, str):
+                size = len(body) if body.isascii() else len(body.encode(self.charset))
+                self.headers["content-length"] = str(size)
+            elif isinstance(body, (bytes, bytearray, memoryview)):
+                self.headers["content-length"] = str(len(body))
+
+        content_type = self.media_type if media_type is None else media_type
+        if content_type is not None and "content-type" not in self.headers:
+            if content_type.startswith("text/"):
+                content_type += "; charset=" + self.charset
+            self.headers["content-type"] = content_type
+
+    def add_header(self, key: str, value: str) -> None:
         """
-        Removed background paramter.
+        Add a header without replacing the values it already has.
         """
-        super().__init__(
-            content=content,
-            status_code=status_code,
-            headers=headers,
-            media_type=media_type,
-            background=None,
+        key = key.lower()
+        current = self.headers.get(key)
+        if current is None:
+            self.headers[key] = value
+        elif isinstance(current, list):
+            current.append(value)
+        else:
+            self.headers[key] = [current, value]
+
+    def set_cookie(
+        self,
+        key: str,
+        value: str = "",
+        max_age: Optional[int] = None,
+        expires: Optional[Union[datetime, str, int]] = None,
+        path: Optional[str] = "/",
+        domain: Optional[str] = None,
+        secure: bool = False,
+        httponly: bool = False,
+        samesite: Optional[Literal["lax", "strict", "none"]] = "lax",
+    ) -> None:
+        # deferred, cookies are only set by some handlers.
+        from email.utils import format_datetime
+        from http.cookies import SimpleCookie
+
+        cookie: SimpleCookie = SimpleCookie()
+        cookie[key] = value
+        if max_age is not None:
+            cookie[key]["max-age"] = max_age
+        if expires is not None:
+            if isinstance(expires, datetime):
+                cookie[key]["expires"] = format_datetime(expires, usegmt=True)
+            else:
+                cookie[key]["expires"] = expires
+        if path is not None:
+            cookie[key]["path"] = path
+        if domain is not None:
+            cookie[key]["domain"] = domain
+        if secure:
+            cookie[key]["secure"] = True
+        if httponly:
+            cookie[key]["httponly"] = True
+        if samesite is not None:
+            if samesite.lower() not in {"strict", "lax", "none"}:
+                raise ValueError("samesite must be either 'strict', 'lax' or 'none'")
+            cookie[key]["samesite"] = samesite
+        self.add_header("set-cookie", cookie.output(header="").strip())
+
+    def delete_cookie(
+        self,
+        key: str,
+        path: Optional[str] = "/",
+        domain: Optional[str] = None,
+        secure: bool = False,
+        httponly: bool = False,
+        samesite: Optional[Literal["lax", "strict", "none"]] = "lax",
+    ) -> None:
+        self.set_cookie(
+            key,
+            max_age=0,
+            expires=0,
+            path=path,
+            domain=domain,
+            secure=secure,
+            httponly=httponly,
+            samesite=samesite,
         )
 
-    def __call__(self) -> HandlerResult:  # type: ignore[override]
-        result = {"statusCode": self.status_code}
-        if self.body is not None:
-            result["body"] = self.body
+    def __call__(self) -> HandlerResult:
+        result: WebResult = {"statusCode": self.status_code}
+        body = self.body
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            # Digital Ocean expects binary bodies to be base64 encoded.
+            result["body"] = b2a_base64(body, newline=False).decode("ascii")
+            result["isBase64Encoded"] = True
+
+        elif body is not None:
+            result["body"] = body
 
         if self.headers:
-            result["headers"] = dict(self.headers)
+            result["headers"] = {
+                key: value[:] if isinstance(value, list) else value
+                for key, value in self.headers.items()
+            }
 
         return result
 
-    def render(self, content: Any) -> Any:
-        return content
+
+def copy_result(result: HandlerResult) -> HandlerResult:
+    """
+    Copy a result that is reused, such as a precomputed error result, so
+    that outer layers can modify the headers of the one they are given.
+    """
+    copy = cast(WebResult, result).copy()
+    if "headers" in copy:
+        copy["headers"] = dict(copy["headers"])
+    return copy
 
 
 class HTMLResponse(Response):
+    __slots__ = ()
     media_type = "text/html"
 
 
 class PlainTextResponse(Response):
+    __slots__ = ()
     media_type = "text/plain"
 
 
 class JSONResponse(Response):
+    __slots__ = ()
     media_type = "application/json"
 
-    def render(self, content: Any) -> str:  # type: ignore[override]
-        return json.dumps(
-            content,
-            ensure_ascii=False,
-            allow_nan=False,
-            cls=JsonEncoder,
-            indent=None,
-            separators=(",", ":"),
+    def render(self, content: Any) -> str:
+        timings = get_timings()
+        if timings is None:
+            return json.dumps(content)
+
+        start = perf_counter_ns()
+        body = json.dumps(content)
+        timings.add("render", start)
+        return body
+
+
+class BytesResponse(Response):
+    __slots__ = ()
+    media_type = "application/octet-stream"
+
+
+class CachedFile(NamedTuple):
+    body: str  # base64 encoded
+    content_length: int
+    etag: str
+    media_type: str
+
+
+# Files are read once per warm container.
+_file_cache: dict[str, CachedFile] = {}
+
+
+def load_file(path: str) -> CachedFile:
+    try:
+        return _file_cache[path]
+    except KeyError:
+        pass
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    media_type, _ = mimetypes.guess_type(path)
+    cached_file = CachedFile(
+        body=b2a_base64(data, newline=False).decode("ascii"),
+        content_length=len(data),
+        etag=f'"{blake2b(data, digest_size=16).hexdigest()}"',
+        media_type=media_type or "application/octet-stream",
+    )
+    _file_cache[path] = cached_file
+    return cached_file
+
+
+class FileResponse(Response):
+    """
+    Returns a file that is bundled with the function.
+    The file is assumed not to change while the container is warm, its
+    contents, base64 encoding and ETag are cached by path after the first read.
+    """
+
+    __slots__ = ("path", "file")
+
+    def __init__(
+        self,
+        path: str,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+    ) -> None:
+        self.path = path
+        self.file = load_file(path)
+        super().__init__(
+            status_code=status_code,
+            headers=headers,
+            media_type=self.file.media_type if media_type is None else media_type,
         )
+        self.headers.setdefault("content-length", str(self.file.content_length))
+        self.headers.setdefault("etag", self.file.etag)
+
+    def __call__(self) -> HandlerResult:
+        result = super().__call__()
+        result["body"] = self.file.body
+        result["isBase64Encoded"] = True
+        return result
@@ -1,19 +1,161 @@
-from typing import Any, Optional
+from collections.abc import Sequence
+from enum import Enum
+import re
+from time import perf_counter_ns
+from typing import Any, Callable, Optional, TypeVar, Union, cast
 
-from starlette.exceptions import HTTPException
-from starlette.routing import compile_path, get_name, Match
+from starlette.convertors import CONVERTOR_TYPES, Convertor
 
-from seastar.exceptions import WebEventException
+from seastar import json
+from seastar.concurrency import is_async_callable, run_until_complete
+from seastar.datastructures import get_header
+from seastar.exceptions import PrecomputedHTTPException, WebEventException
+from seastar.middleware.cache import CacheMiddleware
+from seastar.params import compile_injector
 from seastar.requests import Request
-from seastar.responses import PlainTextResponse
-from seastar.types import Context, Event, EventHandler, HandlerResult, WebHandler
+from seastar.responses import PlainTextResponse, copy_result
+from seastar.scope import get_request, get_scope, is_entry_point
+from seastar.timing import get_timings
+from seastar.types import (
+    AsyncWebHandler,
+    Context,
+    Endpoint,
+    Event,
+    EventHandler,
+    HandlerResult,
+    HeaderValue,
+    WebHandler,
+    WebResult,
+)
+from seastar.validation import compile_schema
 
 
-def request_response(func: WebHandler) -> EventHandler:
+HandlerT = TypeVar("HandlerT", WebHandler, AsyncWebHandler, Endpoint)
+
+# Match parameters in paths, eg. '{param}', and '{param:int}'
+PARAM_REGEX = re.compile("{([a-zA-Z_][a-zA-Z0-9_]*)(:[a-zA-Z_][a-zA-Z0-9_]*)?}")
+
+
+class Match(Enum):
+    NONE = 0
+    PARTIAL = 1
+    FULL = 2
+
+
+# Error results are built once and copied, see method_not_allowed_result.
+NOT_FOUND_RESULT = PlainTextResponse("Not Found", status_code=404)()
+
+
+def method_not_allowed_result(allow: str) -> HandlerResult:
+    response = PlainTextResponse(
+        "Method Not Allowed", status_code=405, headers={"Allow": allow}
+    )
+    return response()
+
+
+def get_name(endpoint: Callable[..., Any]) -> str:
+    return getattr(endpoint, "__name__", endpoint.__class__.__name__)
+
+
+def compile_path(path: str) -> tuple[re.Pattern[str], str, dict[str, Convertor[Any]]]:
+    """
+    A minimal version of starlette.routing.compile_path that only handles paths.
+    Given a path like "/{username:str}", return a three-tuple of
+    (regex, format, {param_name: convertor}).
+    """
+    path_regex = "^"
+    path_format = ""
+    param_convertors: dict[str, Convertor[Any]] = {}
+
+    idx = 0
+    for match in PARAM_REGEX.finditer(path):
+        param_name, convertor_type = match.groups("str")
+        convertor_type = convertor_type.lstrip(":")
+        if convertor_type not in CONVERTOR_TYPES:
+            raise ValueError(f"Unknown path convertor '{convertor_type}'")
+
+        if param_name in param_convertors:
+            raise ValueError(f"Duplicated param name {param_name} at path {path}")
+
+        path_regex += re.escape(path[idx : match.start()])
+        path_regex += f"(?P<{param_name}>{CONVERTOR_TYPES[convertor_type].regex})"
+        path_format += path[idx : match.start()] + "{%s}" % param_name
+        param_convertors[param_name] = CONVERTOR_TYPES[convertor_type]
+        idx = match.end()
+
+    path_regex += re.escape(path[idx:]) + "$"
+    path_format += path[idx:]
+    return re.compile(path_regex), path_format, param_convertors
+
+
+def drop_body(result: HandlerResult) -> HandlerResult:
+    """
+    Remove the body of the result of a HEAD request, keeping the length of
+    the body the GET request would have returned in Content-Length.
+    """
+    if not result or "body" not in result:
+        return result
+
+    head_result = cast(WebResult, result).copy()
+    body = head_result.pop("body")
+    is_base64_encoded = head_result.pop("isBase64Encoded", False)
+    headers: dict[str, HeaderValue] = dict(head_result.get("headers", {}))
+    if get_header(headers, "content-length") is None:
+        if is_base64_encoded and isinstance(body, str):
+            size = len(body) * 3 // 4 - body[-2:].count("=")
+        elif isinstance(body, str):
+            size = len(body.encode())
+        else:
+            size = len(json.dumps(body).encode())
+        headers["content-length"] = str(size)
+    head_result["headers"] = headers
+    return head_result
+
+
+def request_response(
+    func: Callable[..., Any],
+    *,
+    max_body_size: Optional[int] = None,
+    path_params: Optional[set[str]] = None,
+    body_schema: Optional[Any] = None,
+    parameters_schema: Optional[Any] = None,
+) -> EventHandler:
+    is_async = is_async_callable(func)
+    injector = compile_injector(func, path_params)
+    body_validator = None
+    if body_schema is not None:
+        body_validator = compile_schema(body_schema, "body")
+    parameters_validator = None
+    if parameters_schema is not None:
+        parameters_validator = compile_schema(parameters_schema, "parameters")
+    if injector is None:
+        endpoint = func
+    else:
+
+        def endpoint(request: Request) -> Any:
+            return func(**injector(request))
+
     def wrapper(event: Event, context: Context) -> HandlerResult:
-        request = Request(event)
-        response = func(request)
-        return response()
+        request = get_request(event, max_body_size=max_body_size)
+        request.body_validator = body_validator
+        request.parameters_validator = parameters_validator
+        timings = get_timings()
+        if timings is None:
+            response = endpoint(request)
+            if is_async:
+                response = run_until_complete(response)
+            return response()  # type: ignore[no-any-return]
+
+        start = perf_counter_ns()
+        response = endpoint(request)
+        if is_async:
+            response = run_until_complete(response)
+        timings.add("handler", start)
+
+        start = perf_counter_ns()
+        result = response()
+        timings.add("response", start)
+        return result  # type: ignore[no-any-return]
 
     return wrapper
 
@@ -22,10 +164,15 @@ class Route:
     def __init__(
         self,
         path: str,
-        endpoint: WebHandler,
+        endpoint: Union[WebHandler, AsyncWebHandler, Endpoint],
         *,
         methods: Optional[list[str]] = None,
         name: Optional[str] = None,
+        max_body_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
+        cache_vary: Sequence[str] = (),
+        body_schema: Optional[Any] = None,
+        parameters_schema: Optional[Any] = None,
     ) -> None:
         # assert path.startswith("/"), "Routed paths must start with '/'"
         self.path = path
@@ -36,20 +183,39 @@ class Route:
             self.methods = {"GET"}
         else:
             self.methods = {method.upper() for method in methods}
+        if "GET" in self.methods:
+            self.methods.add("HEAD")
+        self.allow = ", ".join(sorted(self.methods))
+        self.method_not_allowed = method_not_allowed_result(self.allow)
 
-        self.app = request_response(endpoint)
+        self.max_body_size = max_body_size
         self.path_regex, self.path_format, self.param_convertors = compile_path(path)
+        self.app = request_response(
+            endpoint,
+            max_body_size=max_body_size,
+            path_params=set(self.param_convertors),
+            body_schema=body_schema,
+            parameters_schema=parameters_schema,
+        )
+        if cache_ttl is not None:
+            self.app = CacheMiddleware(self.app, ttl=cache_ttl, vary=cache_vary)
 
     def __call__(self, event: Event, context: Context) -> HandlerResult:
         if "http" not in event:
             raise WebEventException("The event was expected to be a web event.")
 
-        _ = event.setdefault("__seastar", {}).setdefault("entry_point", self) is self
+        get_scope(event, self)
+
+        timings = get_timings()
+        if timings is not None:
+            start = perf_counter_ns()
 
         match, path_params = self.matches(event)
+        if timings is not None:
+            timings.add("route", start)
+
         if match == Match.NONE:
-            response = PlainTextResponse("Not Found", status_code=404)
-            return response()
+            return copy_result(NOT_FOUND_RESULT)
 
         event["http"].setdefault("path_params", path_params)
         return self.handle(event, context)
@@ -75,15 +241,231 @@ class Route:
         assert "http" in event, "Event is not a web event."
 
         if event["http"]["method"] not in self.methods:
-            headers = {"Allow": ", ".join(self.methods)}
-            is_entry_point = event.get("__seastar", {}).get("entry_point") is self
+            if is_entry_point(event, self):
+                return copy_result(self.method_not_allowed)
+
+            raise PrecomputedHTTPException(
+                405, self.method_not_allowed, headers={"Allow": self.allow}
+            )
+
+        if event["http"]["method"] == "HEAD" and is_entry_point(event, self):
+            return drop_body(self.app(event, context))
+        return self.app(event, context)
+
 
-            if is_entry_point:
-                response = PlainTextResponse(
-                    "Method Not Allowed", status_code=405, headers=headers
+class Router:
+    """
+    Dispatches a single web function to many routes.
+
+    Static paths are resolved with a dictionary lookup and parameterized paths
+    are resolved with a single combined regex, so dispatch does not walk the
+    routes one by one.
+    """
+
+    def __init__(self, routes: Optional[Sequence[Route]] = None) -> None:
+        self.routes: list[Route] = []
+        self._static_routes: dict[str, list[Route]] = {}
+        self._dynamic_routes: dict[str, list[Route]] = {}
+        self._dynamic_regex: Optional[re.Pattern[str]] = None
+        self._dynamic_groups: list[tuple[str, list[Route], dict[str, str]]] = []
+        self._dynamic_index: dict[str, int] = {}
+        # 405 results by the set of methods allowed for the path.
+        self._method_not_allowed: dict[frozenset[str], HandlerResult] = {}
+        self._compiled = True
+
+        for route in routes or []:
+            self.add(route)
+
+    def add(self, route: Route) -> None:
+        self.routes.append(route)
+        if route.param_convertors:
+            key = route.path_regex.pattern
+            self._dynamic_routes.setdefault(key, []).append(route)
+            self._compiled = False
+        else:
+            self._static_routes.setdefault(route.path, []).append(route)
+
+    def add_route(
+        self,
+        path: str,
+        endpoint: Union[WebHandler, AsyncWebHandler, Endpoint],
+        *,
+        methods: Optional[list[str]] = None,
+        name: Optional[str] = None,
+        max_body_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
+        cache_vary: Sequence[str] = (),
+        body_schema: Optional[Any] = None,
+        parameters_schema: Optional[Any] = None,
+    ) -> None:
+        route = Route(
+            path,
+            endpoint,
+            methods=methods,
+            name=name,
+            max_body_size=max_body_size,
+            cache_ttl=cache_ttl,
+            cache_vary=cache_vary,
+            body_schema=body_schema,
+            parameters_schema=parameters_schema,
+        )
+        self.add(route)
+
+    def route(
+        self,
+        path: str,
+        *,
+        methods: Optional[list[str]] = None,
+        name: Optional[str] = None,
+        max_body_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
+        cache_vary: Sequence[str] = (),
+        body_schema: Optional[Any] = None,
+        parameters_schema: Optional[Any] = None,
+    ) -> Callable[[HandlerT], HandlerT]:
+        def decorator(func: HandlerT) -> HandlerT:
+            self.add_route(
+                path,
+                func,
+                methods=methods,
+                name=name,
+                max_body_size=max_body_size,
+                cache_ttl=cache_ttl,
+                cache_vary=cache_vary,
+                body_schema=body_schema,
+                parameters_schema=parameters_schema,
+            )
+            return func
+
+        return decorator
+
+    def compile(self) -> None:
+        """
+        Combine the patterns of all parameterized routes into one regex.
+        Each route pattern becomes a named alternative and its parameter
+        groups are renamed so that they are unique across alternatives.
+        """
+        alternatives = []
+        self._dynamic_groups = []
+        self._dynamic_index = {}
+        for index, (pattern, routes) in enumerate(self._dynamic_routes.items()):
+            group = f"_{index}"
+            param_groups = {}
+            for param_name in routes[0].param_convertors:
+                param_groups[param_name] = f"{group}_{param_name}"
+
+            def rename(match: re.Match[str]) -> str:
+                return f"(?P<{param_groups[match.group(1)]}>"
+
+            body = re.sub(r"\(\?P<(\w+)>", rename, pattern[1:-1])
+            alternatives.append(f"(?P<{group}>{body})")
+            self._dynamic_groups.append((group, routes, param_groups))
+            self._dynamic_index[group] = index
+
+        if alternatives:
+            self._dynamic_regex = re.compile("^(?:" + "|".join(alternatives) + ")$")
+        else:
+            self._dynamic_regex = None
+
+        self._compiled = True
+
+    def __call__(self, event: Event, context: Context) -> HandlerResult:
+        if "http" not in event:
+            raise WebEventException("The event was expected to be a web event.")
+
+        get_scope(event, self)
+
+        timings = get_timings()
+        if timings is not None:
+            start = perf_counter_ns()
+
+        match, route, path_params = self.matches(event)
+        if timings is not None:
+            timings.add("route", start)
+
+        if match == Match.NONE:
+            return copy_result(NOT_FOUND_RESULT)
+
+        if match == Match.PARTIAL:
+            allowed = frozenset(self.allowed_methods(event["http"]["path"]))
+            allow = ", ".join(sorted(allowed))
+
+            result = self._method_not_allowed.get(allowed)
+            if result is None:
+                result = self._method_not_allowed[allowed] = (
+                    method_not_allowed_result(allow)
                 )
-                return response()
+            if is_entry_point(event, self):
+                return copy_result(result)
 
-            raise HTTPException(status_code=405, headers=headers)
+            raise PrecomputedHTTPException(405, result, headers={"Allow": allow})
 
-        return self.app(event, context)
+        assert route is not None
+        event["http"].setdefault("path_params", path_params)
+        if event["http"]["method"] == "HEAD" and is_entry_point(event, self):
+            return drop_body(route.handle(event, context))
+        return route.handle(event, context)
+
+    def matches(self, event: Event) -> tuple[Match, Optional[Route], dict[str, Any]]:
+        path = event["http"]["path"]
+        method = event["http"]["method"]
+        partial: Optional[tuple[Route, dict[str, Any]]] = None
+
+        static_routes = self._static_routes.get(path)
+        if static_routes is not None:
+            for route in static_routes:
+                if method in route.methods:
+                    return Match.FULL, route, self._path_params(event, route, {})
+            partial = static_routes[0], self._path_params(event, static_routes[0], {})
+
+        if not self._compiled:
+            self.compile()
+
+        match = None
+        if self._dynamic_regex is not None:
+            match = self._dynamic_regex.match(path)
+
+        if match is not None:
+            # The combined regex only reports the first alternative that matches.
+            # If none of its routes accept the method, fall back to the remaining
+            # alternatives since one of them could still be a full match.
+            start = self._dynamic_index[match.lastgroup]  # type: ignore[index]
+            for group, routes, param_groups in self._dynamic_groups[start:]:
+                if group == match.lastgroup:
+                    values = {
+                        name: match.group(group_name)
+                        for name, group_name in param_groups.items()
+                    }
+                else:
+                    submatch = routes[0].path_regex.match(path)
+                    if submatch is None:
+                        continue
+                    values = submatch.groupdict()
+
+                for route in routes:
+                    if method in route.methods:
+                        path_params = self._path_params(event, route, values)
+                        return Match.FULL, route, path_params
+
+                    if partial is None:
+                        partial = route, self._path_params(event, route, values)
+
+        if partial is None:
+            return Match.NONE, None, {}
+
+        return Match.PARTIAL, partial[0], partial[1]
+
+    def _path_params(
+        self, event: Event, route: Route, values: dict[str, str]
+    ) -> dict[str, Any]:
+        path_params = dict(event["http"].get("path_params", {}))
+        for key, value in values.items():
+            path_params[key] = route.param_convertors[key].convert(value)
+        return path_params
+
+    def allowed_methods(self, path: str) -> set[str]:
+        methods: set[str] = set()
+        for route in self.routes:
+            if route.path_regex.match(path):
+                methods |= route.methods
+        return methods
@@ -0,0 +1,39 @@
+from typing import Any, Optional
+
+from seastar.requests import Request
+from seastar.types import Event
+
+
+def get_scope(event: Event, app: Any) -> dict[str, Any]:
+    """
+    Return the per-invocation scope that is stored in the event as '__seastar'.
+    The first app to see the event becomes the entry point.
+    """
+    scope = event.get("__seastar")
+    if scope is None:
+        scope = event["__seastar"] = {"entry_point": app}
+    elif "entry_point" not in scope:
+        scope["entry_point"] = app
+    return scope
+
+
+def is_entry_point(event: Event, app: Any) -> bool:
+    scope = event.get("__seastar")
+    return scope is not None and scope.get("entry_point") is app
+
+
+def get_request(event: Event, *, max_body_size: Optional[int] = None) -> Request:
+    """
+    Return the Request of the invocation, so that every layer shares one
+    instance along with everything it has already parsed.
+    """
+    scope = event.get("__seastar")
+    if scope is None:
+        scope = event["__seastar"] = {}
+
+    request = scope.get("request")
+    if request is None:
+        request = scope["request"] = Request(event, max_body_size=max_body_size)
+    elif max_body_size is not None:
+        request.max_body_size = max_body_size
+    return request
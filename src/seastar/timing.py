@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Iterator, Optional
+
+
+_current_timings: ContextVar[Optional["Timings"]] = ContextVar(
+    "seastar_timings", default=None
+)
+
+
+def get_timings() -> Optional["Timings"]:
+    """
+    Return the timings of the current invocation, or None when timing is
+    not enabled. Instrumented code checks for None before doing any work.
+    """
+    return _current_timings.get()
+
+
+class Timings:
+    """
+    Durations of the phases of an invocation, in nanoseconds.
+    Spans can overlap, for example the handler span includes rendering.
+    """
+
+    def __init__(self) -> None:
+        self.start_ns = perf_counter_ns()
+        self.spans: list[tuple[str, int]] = []
+
+    def add(self, name: str, start_ns: int, end_ns: Optional[int] = None) -> None:
+        if end_ns is None:
+            end_ns = perf_counter_ns()
+        self.spans.append((name, end_ns - start_ns))
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start_ns = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, start_ns)
+
+    def as_dict(self) -> dict[str, float]:
+        """
+        Return the durations in milliseconds, repeated spans are summed.
+        """
+        durations: dict[str, float] = {}
+        for name, duration_ns in self.spans:
+            durations[name] = durations.get(name, 0) + duration_ns / 1_000_000
+        return durations
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            f"{name};dur={duration:.3f}" for name, duration in self.as_dict().items()
+        )
@@ -1,9 +1,18 @@
-from typing import Any, Callable, Protocol, TypedDict, TYPE_CHECKING, Union
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Protocol,
+    TypedDict,
+    TYPE_CHECKING,
+    Union,
+)
 from typing_extensions import NotRequired, TypeAlias
 
 
 if TYPE_CHECKING:
     # avoids a circular import error.
+    from seastar.datastructures import State
     from seastar.requests import Request
     from seastar.responses import Response
 
@@ -58,19 +67,33 @@ class Context(Protocol):
 JSON: TypeAlias = Union[dict[str, "JSON"], list["JSON"], str, int, float, bool, None]
 
 
+# Repeated headers, ex. Set-Cookie, are a list of values.
+HeaderValue: TypeAlias = Union[str, list[str]]
+
+
 class WebResult(TypedDict):
     body: NotRequired[JSON]
     statusCode: NotRequired[int]
-    headers: NotRequired[dict[str, str]]
+    headers: NotRequired[dict[str, HeaderValue]]
+    isBase64Encoded: NotRequired[bool]
 
 
 HandlerResult: TypeAlias = Union[WebResult, dict[str, JSON]]
 
 EventHandler: TypeAlias = Callable[[Event, Context], HandlerResult]
 WebHandler: TypeAlias = Callable[["Request"], "Response"]
+AsyncWebHandler: TypeAlias = Callable[["Request"], Awaitable["Response"]]
+# An endpoint whose arguments are injected from the request, see seastar.params.
+Endpoint: TypeAlias = Callable[..., Union["Response", Awaitable["Response"]]]
 Handler: TypeAlias = Union[EventHandler, WebHandler]
 
 ExceptionHandlerKey: TypeAlias = Union[int, type[Exception]]
 EventExceptionHandler: TypeAlias = Callable[[Event, Context, Exception], HandlerResult]
 WebExceptionHandler: TypeAlias = Callable[["Request", Exception], "Response"]
+AsyncWebExceptionHandler: TypeAlias = Callable[
+    ["Request", Exception], Awaitable["Response"]
+]
+AnyWebExceptionHandler: TypeAlias = Union[WebExceptionHandler, AsyncWebExceptionHandler]
 ExceptionHandler: TypeAlias = Union[EventExceptionHandler, WebExceptionHandler]
+
+LifespanHook: TypeAlias = Callable[["State"], Union[None, Awaitable[None]]]
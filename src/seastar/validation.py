@@ -0,0 +1,285 @@
+"""
+Validation of JSON values against dataclass and TypedDict schemas.
+
+A schema is compiled once into a tree of validator functions, so type hints
+and fields are only inspected when a route is created. Validating a value
+collects every error with the path to the offending item, ex:
+
+    [{"loc": ["body", "items", 0, "price"], "msg": "expected a number"}]
+"""
+import dataclasses
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Literal,
+    Optional,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from starlette.exceptions import HTTPException
+from typing_extensions import is_typeddict
+
+
+Loc = tuple[Union[str, int], ...]
+ErrorList = list[dict[str, Any]]
+# A compiled validator returns the validated value, or _invalid after
+# appending to the errors.
+Validator = Callable[[Any, Loc, ErrorList], Any]
+
+_invalid = object()
+
+
+class ValidationError(HTTPException):
+    """
+    Raised with the list of errors when a value does not match its schema.
+    It is a 422 HTTPException, handled by validation_exception_handler.
+    """
+
+    def __init__(self, errors: ErrorList) -> None:
+        super().__init__(status_code=422, detail="Unprocessable Entity")
+        self.errors = errors
+
+
+def error(errors: ErrorList, loc: Loc, msg: str) -> Any:
+    errors.append({"loc": list(loc), "msg": msg})
+    return _invalid
+
+
+def compile_type(
+    expected: Union[type, tuple[type, ...]], exclude: tuple[type, ...], msg: str
+) -> Validator:
+    def validate(value: Any, loc: Loc, errors: ErrorList) -> Any:
+        if isinstance(value, exclude) or not isinstance(value, expected):
+            return error(errors, loc, msg)
+        return value
+
+    return validate
+
+
+def compile_float() -> Validator:
+    def validate(value: Any, loc: Loc, errors: ErrorList) -> Any:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return error(errors, loc, "expected a number")
+        return float(value)
+
+    return validate
+
+
+def compile_any() -> Validator:
+    return lambda value, loc, errors: value
+
+
+def compile_enum(cls: type[Enum]) -> Validator:
+    members = {member.value: member for member in cls}
+    msg = "expected one of " + ", ".join(repr(value) for value in members)
+
+    def validate(value: Any, loc: Loc, errors: ErrorList) -> Any:
+        try:
+            return members[value]
+        except (KeyError, TypeError):
+            return error(errors, loc, msg)
+
+    return validate
+
+
+def compile_literal(values: tuple[Any, ...]) -> Validator:
+    msg = "expected one of " + ", ".join(repr(value) for value in values)
+
+    def validate(value: Any, loc: Loc, errors: ErrorList) -> Any:
+        for allowed in values:
+            if value == allowed and type(value) is type(allowed):
+                return value
+        return error(errors, loc, msg)
+
+    return validate
+
+
+def compile_union(args: tuple[Any, ...]) -> Validator:
+    nullable = type(None) in args
+    validators = [compile_validator(arg) for arg in args if arg is not type(None)]
+
+    if len(validators) == 1:
+        validator = validators[0]
+
+        def validate_optional(value: Any, loc: Loc, errors: ErrorList) -> Any:
+            if value is None and nullable:
+                return None
+            return validator(value, loc, errors)
+
+        return validate_optional
+
+    def validate(value: Any, loc: Loc, errors: ErrorList) -> Any:
+        if value is None and nullable:
+            return None
+        for validator in validators:
+            attempt: ErrorList = []
+            result = validator(value, loc, attempt)
+            if not attempt:
+                return result
+        return error(errors, loc, "does not match any of the allowed types")
+
+    return validate
+
+
+def compile_list(item_type: Any, container: type) -> Validator:
+    validate_item = compile_validator(item_type)
+
+    def validate(value: Any, loc: Loc, errors: ErrorList) -> Any:
+        if not isinstance(value, list):
+            return error(errors, loc, "expected an array")
+
+        count = len(errors)
+        items = [validate_item(item, (*loc, i), errors) for i, item in enumerate(value)]
+        if len(errors) > count:
+            return _invalid
+        return items if container is list else container(items)
+
+    return validate
+
+
+def compile_dict(value_type: Any) -> Validator:
+    validate_value = compile_validator(value_type)
+
+    def validate(value: Any, loc: Loc, errors: ErrorList) -> Any:
+        if not isinstance(value, dict):
+            return error(errors, loc, "expected an object")
+
+        count = len(errors)
+        result = {k: validate_value(v, (*loc, k), errors) for k, v in value.items()}
+        if len(errors) > count:
+            return _invalid
+        return result
+
+    return validate
+
+
+def compile_fields(
+    hints: dict[str, Any], required: set[str]
+) -> Callable[[Any, Loc, ErrorList], Optional[dict[str, Any]]]:
+    fields = [
+        (name, compile_validator(annotation), name in required)
+        for name, annotation in hints.items()
+    ]
+
+    def validate(value: Any, loc: Loc, errors: ErrorList) -> Optional[dict[str, Any]]:
+        if not isinstance(value, dict):
+            error(errors, loc, "expected an object")
+            return None
+
+        count = len(errors)
+        result = {}
+        for name, validator, is_required in fields:
+            if name in value:
+                result[name] = validator(value[name], (*loc, name), errors)
+            elif is_required:
+                error(errors, (*loc, name), "field required")
+
+        if len(errors) > count:
+            return None
+        return result
+
+    return validate
+
+
+def compile_typeddict(schema: type) -> Validator:
+    validate_fields = compile_fields(
+        get_type_hints(schema), set(schema.__required_keys__)  # type: ignore
+    )
+
+    def validate(value: Any, loc: Loc, errors: ErrorList) -> Any:
+        result = validate_fields(value, loc, errors)
+        return _invalid if result is None else result
+
+    return validate
+
+
+def compile_dataclass(schema: type) -> Validator:
+    hints = get_type_hints(schema)
+    fields = [field for field in dataclasses.fields(schema) if field.init]
+    required = {
+        field.name
+        for field in fields
+        if field.default is dataclasses.MISSING
+        and field.default_factory is dataclasses.MISSING
+    }
+    validate_fields = compile_fields(
+        {field.name: hints[field.name] for field in fields}, required
+    )
+
+    def validate(value: Any, loc: Loc, errors: ErrorList) -> Any:
+        result = validate_fields(value, loc, errors)
+        if result is None:
+            return _invalid
+        try:
+            return schema(**result)
+        except (TypeError, ValueError) as exc:
+            # raised by __post_init__ checks.
+            return error(errors, loc, str(exc))
+
+    return validate
+
+
+def compile_validator(schema: Any) -> Validator:
+    """
+    Compile a type, ex. a dataclass, a TypedDict or list[int], to a validator.
+    """
+    if schema is Any or schema is object:
+        return compile_any()
+    if schema is bool:
+        return compile_type(bool, (), "expected a boolean")
+    if schema is int:
+        return compile_type(int, (bool,), "expected an integer")
+    if schema is float:
+        return compile_float()
+    if schema is str:
+        return compile_type(str, (), "expected a string")
+    if schema is type(None):
+        return compile_type(type(None), (), "expected null")
+    if dataclasses.is_dataclass(schema) and isinstance(schema, type):
+        return compile_dataclass(schema)
+    if is_typeddict(schema):
+        return compile_typeddict(schema)
+    if isinstance(schema, type) and issubclass(schema, Enum):
+        return compile_enum(schema)
+    if schema is list or schema is tuple:
+        return compile_list(Any, schema)
+    if schema is dict:
+        return compile_dict(Any)
+
+    origin = get_origin(schema)
+    args = get_args(schema)
+    if origin is Union:
+        return compile_union(args)
+    if origin is Literal:
+        return compile_literal(args)
+    if origin in (list, tuple, set, frozenset):
+        if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+            args = args[:1]
+        elif origin is tuple and len(args) > 1:
+            raise TypeError(f"Fixed length tuples are not supported: {schema}")
+        return compile_list(args[0] if args else Any, origin)
+    if origin is dict:
+        return compile_dict(args[1] if args else Any)
+
+    raise TypeError(f"Cannot validate values of type {schema!r}")
+
+
+def compile_schema(schema: Any, loc: str) -> Callable[[Any], Any]:
+    """
+    Return a function that validates a value against the schema, raising a
+    ValidationError with errors located under loc.
+    """
+    validator = compile_validator(schema)
+
+    def validate(value: Any) -> Any:
+        errors: ErrorList = []
+        result = validator(value, (loc,), errors)
+        if errors:
+            raise ValidationError(errors)
+        return result
+
+    return validate
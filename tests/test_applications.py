@@ -0,0 +1,114 @@
+from starlette.exceptions import HTTPException
+
+from seastar.applications import Seastar
+from seastar.middleware import Middleware
+from seastar.middleware.conditional import ConditionalGetMiddleware
+from seastar.middleware.cors import CORSMiddleware
+from seastar.middleware.timing import TimingMiddleware
+from seastar.responses import PlainTextResponse
+from seastar.routing import Route
+from seastar.scope import get_request
+
+
+def test_middleware_order():
+    calls = []
+
+    class Recorder:
+        def __init__(self, app, name):
+            self.app = app
+            self.name = name
+
+        def __call__(self, event, context):
+            calls.append(self.name)
+            return self.app(event, context)
+
+    def endpoint(request):
+        return PlainTextResponse("Hello, world!")
+
+    app = Seastar(
+        Route("/", endpoint),
+        middleware=[
+            Middleware(Recorder, name="outer"),
+            Middleware(Recorder, name="inner"),
+        ],
+    )
+    assert app({"http": {"path": "/", "method": "GET"}}, None)["statusCode"] == 200
+    assert calls == ["outer", "inner"]
+
+
+def test_scope_is_shared():
+    requests = []
+
+    def endpoint(request):
+        requests.append(request)
+        return PlainTextResponse(request.state.greeting)
+
+    def startup(state):
+        state.greeting = "Hello, world!"
+
+    app = Seastar(Route("/", endpoint), on_startup=[startup])
+    event = {"http": {"path": "/", "method": "GET"}}
+    assert app(event, None)["body"] == "Hello, world!"
+    assert event["__seastar"]["entry_point"] is app
+    assert requests == [get_request(event)]
+
+
+def test_middleware_exceptions_are_handled():
+    def endpoint(request):
+        return PlainTextResponse("Hello, world!")
+
+    app = Seastar(
+        Route("/", endpoint), middleware=[Middleware(ConditionalGetMiddleware)]
+    )
+    event = {"http": {"path": "/", "method": "GET", "headers": {}}}
+    etag = app(event, None)["headers"]["etag"]
+
+    event = {"http": {"path": "/", "method": "GET", "headers": {"if-none-match": etag}}}
+    result = app(event, None)
+    assert result["statusCode"] == 304
+    assert "body" not in result or not result["body"]
+
+
+def test_exception_handlers():
+    def endpoint(request):
+        raise HTTPException(418)
+
+    app = Seastar(
+        Route("/", endpoint),
+        exception_handlers={418: lambda request, exc: PlainTextResponse("teapot")},
+    )
+
+    @app.exception_handler(RuntimeError)
+    def runtime_error(request, exc):
+        return PlainTextResponse("error", status_code=500)
+
+    assert app({"http": {"path": "/", "method": "GET"}}, None)["body"] == "teapot"
+    assert app.exception_middleware._exception_handlers[RuntimeError] is runtime_error
+
+
+def test_middleware_sees_handled_exceptions():
+    def endpoint(request):
+        raise HTTPException(404)
+
+    app = Seastar(
+        Route("/", endpoint),
+        middleware=[
+            Middleware(CORSMiddleware, allow_origins=["https://a.com"]),
+            Middleware(TimingMiddleware),
+        ],
+    )
+    for method in ("GET", "POST"):
+        event = {
+            "http": {
+                "path": "/",
+                "method": method,
+                "headers": {"origin": "https://a.com"},
+            }
+        }
+        result = app(event, None)
+        assert result["statusCode"] == (404 if method == "GET" else 405)
+        assert result["headers"]["access-control-allow-origin"] == "https://a.com"
+        assert "server-timing" in result["headers"]
+
+    event = {"http": {"path": "/", "method": "GET", "headers": {}}}
+    assert "exception_handler" in app(event, None)["headers"]["server-timing"]
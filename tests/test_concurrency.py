@@ -0,0 +1,77 @@
+import asyncio
+import contextvars
+import functools
+import time
+
+import pytest
+
+from seastar.concurrency import (
+    get_event_loop,
+    is_async_callable,
+    run_parallel,
+    run_until_complete,
+)
+
+
+def test_is_async_callable():
+    async def coro(x):
+        pass
+
+    class AsyncCallable:
+        async def __call__(self):
+            pass
+
+    assert is_async_callable(coro)
+    assert is_async_callable(functools.partial(coro, 1))
+    assert is_async_callable(AsyncCallable())
+    assert not is_async_callable(lambda: None)
+
+
+def test_loop_is_reused():
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    assert run_until_complete(current_loop()) is get_event_loop()
+    assert run_until_complete(current_loop()) is get_event_loop()
+
+
+def test_loop_is_shared_by_threads():
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    loops = run_parallel([lambda: run_until_complete(current_loop())] * 4)
+    assert loops == [get_event_loop()] * 4
+
+
+def test_context_is_copied():
+    var = contextvars.ContextVar("var")
+
+    async def get():
+        return var.get()
+
+    var.set("value")
+    assert run_until_complete(get()) == "value"
+
+
+def test_run_parallel():
+    def slow(value):
+        time.sleep(0.05)
+        return value
+
+    start = time.perf_counter()
+    results = run_parallel([functools.partial(slow, i) for i in range(4)])
+    assert results == [0, 1, 2, 3]
+    assert time.perf_counter() - start < 0.15
+
+
+def test_run_parallel_exception():
+    def fail():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        run_parallel([lambda: 1, fail])
+
+
+def test_run_parallel_timeout():
+    with pytest.raises(TimeoutError):
+        run_parallel([lambda: time.sleep(0.2)], timeout=0.01)
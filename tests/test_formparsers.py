@@ -0,0 +1,103 @@
+from base64 import b64encode
+
+import pytest
+from starlette.exceptions import HTTPException
+
+from seastar.formparsers import MultiPartParser, UploadFile, parse_options_header
+from seastar.requests import Request
+
+
+BOUNDARY = "----boundary"
+
+
+def make_body(*parts):
+    body = b""
+    for headers, data in parts:
+        body += f"--{BOUNDARY}\r\n".encode() + headers.encode() + b"\r\n\r\n"
+        body += data + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+def make_event(body):
+    return {
+        "http": {
+            "headers": {"content-type": f"multipart/form-data; boundary={BOUNDARY}"},
+            "body": b64encode(body).decode(),
+            "isBase64Encoded": True,
+        }
+    }
+
+
+FIELD = ('Content-Disposition: form-data; name="field"', "välue".encode())
+FILE = (
+    'Content-Disposition: form-data; name="file"; filename="a.txt"\r\n'
+    "Content-Type: text/plain",
+    b"line 1\r\nline 2",
+)
+
+
+def test_parse_options_header():
+    assert parse_options_header('form-data; name="a;b"; filename="c\\"d.txt"') == (
+        "form-data",
+        {"name": "a;b", "filename": 'c"d.txt'},
+    )
+    assert parse_options_header(
+        "attachment; filename=a.txt; filename*=utf-8''na%C3%AFve.txt"
+    ) == ("attachment", {"filename": "naïve.txt"})
+
+
+def test_multipart_form():
+    request = Request(make_event(make_body(FIELD, FILE)))
+    form = request.form()
+    assert form["field"] == "välue"
+
+    upload = form["file"]
+    assert isinstance(upload, UploadFile)
+    assert upload.filename == "a.txt"
+    assert upload.content_type == "text/plain"
+    assert upload.size == 14
+    assert upload.read(6) == b"line 1"
+    assert upload.read() == b"\r\nline 2"
+    # the file is a view of the request body, not a copy.
+    assert upload.data.obj is request.body_bytes
+
+
+def test_repeated_fields():
+    other = ('Content-Disposition: form-data; name="field"', b"other")
+    form = Request(make_event(make_body(FIELD, other))).form()
+    assert form.getlist("field") == ["välue", "other"]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"max_part_size": 10}, {"max_size": 100}, {"max_parts": 1}],
+)
+def test_limits(kwargs):
+    request = Request(make_event(make_body(FIELD, FILE)))
+    with pytest.raises(HTTPException) as exc_info:
+        request.form(**kwargs)
+    assert exc_info.value.status_code == 413
+
+
+def test_part_limit_is_checked_before_later_parts():
+    # the second part is malformed, the first one is rejected before it is seen.
+    body = make_body(FILE, ("broken header", b"value"))
+    parser = MultiPartParser(body, BOUNDARY, max_part_size=4)
+    with pytest.raises(HTTPException) as exc_info:
+        list(parser.parse())
+    assert exc_info.value.status_code == 413
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"no boundary",
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data\r\n\r\nvalue".encode(),
+        make_body(("Content-Type: text/plain", b"value")),
+        make_body(("broken header", b"value")),
+    ],
+)
+def test_malformed(body):
+    with pytest.raises(HTTPException) as exc_info:
+        list(MultiPartParser(body, BOUNDARY).parse())
+    assert exc_info.value.status_code == 400
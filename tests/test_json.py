@@ -1,10 +1,24 @@
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+import importlib.util
 import json
 import uuid
 
-from seastar.json import JsonEncoder
+import pytest
+
+import seastar.json
+from seastar.json import (
+    BACKENDS,
+    JsonBackend,
+    JsonEncoder,
+    OrjsonBackend,
+    get_backend,
+    lookup_encoder,
+    register_encoder,
+    set_backend,
+)
+from seastar.responses import JSONResponse
 
 
 def test_dataclass():
@@ -38,4 +52,113 @@ def test_uuid():
 
 def test_other():
     d = {"a": True, "b": "two", "c": 3}
-    assert json.dumps(d, cls=JsonEncoder) == '{"a": true, "b": "two", "c": 3}'
\ No newline at end of file
+    assert json.dumps(d, cls=JsonEncoder) == '{"a": true, "b": "two", "c": 3}'
+
+@pytest.fixture(params=["json", "orjson"])
+def backend(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    return BACKENDS[request.param]()
+
+
+def test_backend_dumps(backend):
+    @dataclass
+    class dclass:
+        x: int
+
+    class Foo(Enum):
+        FOO = "foo"
+
+    o = {
+        "dataclass": dclass(x=1),
+        "date": datetime(year=2023, month=1, day=1),
+        "enum": Foo.FOO,
+        "uuid": uuid.UUID("cf7bbe5a-0886-4154-b24d-7d1b96626d3b"),
+        "text": "café",
+        "none": None,
+    }
+    assert backend.dumps(o) == (
+        '{"dataclass":{"x":1},"date":"2023-01-01T00:00:00","enum":"foo",'
+        '"uuid":"cf7bbe5a-0886-4154-b24d-7d1b96626d3b","text":"café","none":null}'
+    )
+
+
+def test_backend_rejects_nan(backend):
+    with pytest.raises(ValueError):
+        backend.dumps({"value": float("nan")})
+
+    with pytest.raises(ValueError):
+        backend.dumps({"values": [None, (1.5, float("inf"))]})
+
+    assert backend.dumps({"value": None, "text": "null"}) == (
+        '{"value":null,"text":"null"}'
+    )
+
+
+def test_default_backend_rejects_nan(monkeypatch):
+    monkeypatch.delenv("SEASTAR_JSON_BACKEND", raising=False)
+    monkeypatch.setattr(seastar.json, "_backend", None)
+    if importlib.util.find_spec("orjson") is not None:
+        assert type(get_backend()) is OrjsonBackend
+
+    with pytest.raises(ValueError):
+        JSONResponse({"a": float("nan")})
+
+
+def test_orjson_nan_is_null():
+    pytest.importorskip("orjson")
+    backend = OrjsonBackend(strict_nan=False)
+    assert backend.dumps({"value": float("nan"), "none": None}) == (
+        '{"value":null,"none":null}'
+    )
+
+
+def test_backend_loads(backend):
+    assert backend.loads('{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+
+    with pytest.raises(ValueError):
+        backend.loads("invalid_json")
+
+
+def test_set_backend():
+    previous = get_backend()
+    try:
+        set_backend("json")
+        assert type(get_backend()) is JsonBackend
+
+        with pytest.raises(ValueError):
+            set_backend("unknown")
+    finally:
+        set_backend(previous)
+
+
+def test_nested_dataclass():
+    @dataclass
+    class Inner:
+        when: datetime
+
+    @dataclass
+    class Outer:
+        inner: list[Inner]
+        empty: dict
+
+    o = Outer(inner=[Inner(when=datetime(year=2023, month=1, day=1))], empty={})
+    assert (
+        json.dumps(o, cls=JsonEncoder)
+        == '{"inner": [{"when": "2023-01-01T00:00:00"}], "empty": {}}'
+    )
+
+
+def test_register_encoder():
+    class Point:
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+    class Point3D(Point):
+        pass
+
+    assert lookup_encoder(Point3D) is None
+
+    register_encoder(Point, lambda o: [o.x, o.y])
+    assert json.dumps({"p": Point(1, 2)}, cls=JsonEncoder) == '{"p": [1, 2]}'
+    assert json.dumps({"p": Point3D(3, 4)}, cls=JsonEncoder) == '{"p": [3, 4]}'
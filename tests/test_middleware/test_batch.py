@@ -0,0 +1,73 @@
+import threading
+
+from seastar import web_function
+from seastar.middleware.batch import BatchMiddleware
+from seastar.responses import PlainTextResponse
+
+
+@web_function("/items/{item_id:int}")
+def handler(request):
+    if request.path_params["item_id"] == 0:
+        raise RuntimeError()
+    return PlainTextResponse(str(request.path_params["item_id"]))
+
+
+def item(path):
+    return {"http": {"path": path, "method": "GET", "headers": {}}}
+
+
+def test_batch_results_in_order():
+    app = BatchMiddleware(handler)
+    result = app({"batch": [item("/items/1"), item("/items/2"), item("/")]}, None)
+    assert [r["statusCode"] for r in result["batch"]] == [200, 200, 404]
+    assert [r["body"] for r in result["batch"]][:2] == ["1", "2"]
+
+
+def test_batch_errors_are_isolated():
+    app = BatchMiddleware(handler)
+    result = app({"batch": [item("/items/0"), item("/items/3"), "item"]}, None)
+    assert [r["statusCode"] for r in result["batch"]] == [500, 200, 400]
+
+
+def test_batch_parameters():
+    @web_function()
+    def greet(request):
+        return PlainTextResponse(f"Hello, {request.parameters['name']}!")
+
+    app = BatchMiddleware(greet)
+    result = app({"batch": [{"name": "world"}, {"name": "seastar"}]}, None)
+    assert [r["body"] for r in result["batch"]] == ["Hello, world!", "Hello, seastar!"]
+
+
+def test_batch_parallel():
+    threads = set()
+
+    @web_function()
+    def app(request):
+        threads.add(threading.get_ident())
+        return PlainTextResponse(request.parameters["n"])
+
+    batch = BatchMiddleware(app, max_parallel=4)
+    result = batch({"batch": [{"n": str(n)} for n in range(20)]}, None)
+    assert [r["body"] for r in result["batch"]] == [str(n) for n in range(20)]
+    assert threading.get_ident() not in threads
+
+
+def test_not_a_batch():
+    app = BatchMiddleware(handler)
+    assert app(item("/items/5"), None)["body"] == "5"
+
+
+def test_batch_parameter_of_a_request():
+    @web_function(methods=["POST"])
+    def count(request):
+        return PlainTextResponse(str(len(request.parameters["batch"])))
+
+    app = BatchMiddleware(count)
+    event = {
+        "http": {"path": "", "method": "POST", "headers": {}},
+        "batch": [{"name": "world"}, {"name": "seastar"}],
+    }
+    result = app(event, None)
+    assert result["statusCode"] == 200
+    assert result["body"] == "2"
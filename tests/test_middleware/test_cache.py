@@ -0,0 +1,162 @@
+import time
+
+from seastar import web_function
+from seastar.middleware.cache import CacheMiddleware, ResponseCache
+from seastar.responses import JSONResponse, PlainTextResponse
+from seastar.routing import request_response
+
+
+def make_app(headers=None):
+    calls = []
+
+    @request_response
+    def app(request):
+        calls.append(request)
+        return PlainTextResponse(f"call {len(calls)}", headers=headers)
+
+    return app, calls
+
+
+def make_event(method="GET", query="", headers=None):
+    return {
+        "http": {
+            "method": method,
+            "path": "/items",
+            "queryString": query,
+            "headers": headers or {},
+        }
+    }
+
+
+def test_hit():
+    app, calls = make_app()
+    cache = ResponseCache()
+    middleware = CacheMiddleware(app, cache=cache)
+
+    assert middleware(make_event(query="a=1&b=2"), None)["body"] == "call 1"
+    assert middleware(make_event(query="b=2&a=1"), None)["body"] == "call 1"
+    assert middleware(make_event(query="a=2"), None)["body"] == "call 2"
+    assert len(calls) == 2
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_post_not_cached():
+    app, calls = make_app()
+    middleware = CacheMiddleware(app, cache=ResponseCache())
+    middleware(make_event("POST"), None)
+    middleware(make_event("POST"), None)
+    assert len(calls) == 2
+
+
+def test_vary():
+    app, calls = make_app()
+    middleware = CacheMiddleware(app, vary=["Accept"], cache=ResponseCache())
+    middleware(make_event(headers={"accept": "text/plain"}), None)
+    middleware(make_event(headers={"accept": "text/html"}), None)
+    middleware(make_event(headers={"accept": "text/plain"}), None)
+    assert len(calls) == 2
+
+
+def test_result_vary():
+    @request_response
+    def app(request):
+        language = request.headers["accept-language"]
+        return PlainTextResponse(language, headers={"Vary": "Accept-Language"})
+
+    middleware = CacheMiddleware(app, cache=ResponseCache())
+    en = make_event(headers={"accept-language": "en"})
+    fr = make_event(headers={"accept-language": "fr"})
+    assert middleware(en, None)["body"] == "en"
+    assert middleware(fr, None)["body"] == "fr"
+
+    cache = ResponseCache()
+    middleware = CacheMiddleware(app, vary=["Accept-Language"], cache=cache)
+    assert middleware(en, None)["body"] == "en"
+    assert middleware(fr, None)["body"] == "fr"
+    assert middleware(fr, None)["body"] == "fr"
+    assert cache.hits == 1
+
+
+def test_expired(monkeypatch):
+    app, calls = make_app()
+    middleware = CacheMiddleware(app, ttl=10, cache=ResponseCache())
+    monkeypatch.setattr(time, "monotonic", lambda: 100)
+    middleware(make_event(), None)
+    monkeypatch.setattr(time, "monotonic", lambda: 109)
+    middleware(make_event(), None)
+    assert len(calls) == 1
+    monkeypatch.setattr(time, "monotonic", lambda: 110)
+    middleware(make_event(), None)
+    assert len(calls) == 2
+
+
+def test_cache_control():
+    app, calls = make_app(headers={"Cache-Control": "no-store"})
+    middleware = CacheMiddleware(app, cache=ResponseCache())
+    middleware(make_event(), None)
+    middleware(make_event(), None)
+    assert len(calls) == 2
+
+    app, calls = make_app()
+    middleware = CacheMiddleware(app, cache=ResponseCache())
+    middleware(make_event(), None)
+    middleware(make_event(headers={"cache-control": "no-cache"}), None)
+    assert len(calls) == 2
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_size=10)
+    cache.set("a", {"statusCode": 200, "body": "12345"}, ttl=60)
+    cache.set("b", {"statusCode": 200, "body": "12345"}, ttl=60)
+    assert cache.get("a") is not None
+    cache.set("c", {"statusCode": 200, "body": "12345"}, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.size == 10
+
+
+def test_web_function_cache_ttl():
+    calls = []
+
+    @web_function("/items/{item_id}", cache_ttl=60)
+    def handler(request):
+        calls.append(request)
+        return PlainTextResponse(request.path_params["item_id"])
+
+    event = {"http": {"method": "GET", "path": "/items/1", "headers": {}}}
+    assert handler(event, None)["body"] == "1"
+    event = {"http": {"method": "GET", "path": "/items/1", "headers": {}}}
+    assert handler(event, None)["body"] == "1"
+    assert len(calls) == 1
+
+
+def test_credentials_not_shared():
+    @web_function("/me", cache_ttl=60)
+    def handler(request):
+        return JSONResponse({"user": request.headers["authorization"]})
+
+    def event(user):
+        headers = {"authorization": user}
+        return {"http": {"method": "GET", "path": "/me", "headers": headers}}
+
+    assert handler(event("alice"), None)["body"] == '{"user":"alice"}'
+    assert handler(event("bob"), None)["body"] == '{"user":"bob"}'
+
+    @web_function("/me", cache_ttl=60, cache_vary=["Authorization"])
+    def handler(request):
+        return JSONResponse({"user": request.headers["authorization"]})
+
+    assert handler(event("alice"), None)["body"] == '{"user":"alice"}'
+    assert handler(event("bob"), None)["body"] == '{"user":"bob"}'
+    assert handler(event("alice"), None)["body"] == '{"user":"alice"}'
+
+    @web_function("/me", cache_ttl=60)
+    def handler(request):
+        return JSONResponse(
+            {"user": request.headers["authorization"]},
+            headers={"Cache-Control": "public"},
+        )
+
+    assert handler(event("alice"), None)["body"] == '{"user":"alice"}'
+    assert handler(event("bob"), None)["body"] == '{"user":"alice"}'
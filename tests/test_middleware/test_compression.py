@@ -0,0 +1,89 @@
+from base64 import b64decode
+import gzip
+
+from seastar.middleware.compression import CompressionMiddleware, parse_accept_encoding
+from seastar.responses import BytesResponse, PlainTextResponse
+from seastar.routing import request_response
+
+
+BODY = "Hello, world! " * 100
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, deflate, br;q=0") == {"gzip", "deflate"}
+    assert parse_accept_encoding("GZIP;q=0.5") == {"gzip"}
+
+
+def test_gzip():
+    @request_response
+    def app(request):
+        return PlainTextResponse(BODY, headers={"Vary": "Cookie"})
+
+    middleware = CompressionMiddleware(app)
+    event = {"http": {"method": "GET", "headers": {"accept-encoding": "gzip"}}}
+    result = middleware(event, None)
+    assert result["isBase64Encoded"] is True
+    assert gzip.decompress(b64decode(result["body"])).decode() == BODY
+    assert result["headers"]["content-encoding"] == "gzip"
+    assert result["headers"]["vary"] == "Cookie, Accept-Encoding"
+    assert result["headers"]["content-length"] == str(len(b64decode(result["body"])))
+
+
+def test_not_accepted():
+    @request_response
+    def app(request):
+        return PlainTextResponse(BODY)
+
+    middleware = CompressionMiddleware(app)
+    event = {"http": {"method": "GET", "headers": {"accept-encoding": "identity"}}}
+    result = middleware(event, None)
+    assert result["body"] == BODY
+    assert "content-encoding" not in result["headers"]
+
+
+def test_below_minimum_size():
+    @request_response
+    def app(request):
+        return PlainTextResponse("Hello, world!")
+
+    middleware = CompressionMiddleware(app)
+    event = {"http": {"method": "GET", "headers": {"accept-encoding": "gzip"}}}
+    result = middleware(event, None)
+    assert result["body"] == "Hello, world!"
+
+
+def test_excluded_content_type():
+    @request_response
+    def app(request):
+        return BytesResponse(b"\0" * 1000, media_type="image/png")
+
+    middleware = CompressionMiddleware(app)
+    event = {"http": {"method": "GET", "headers": {"accept-encoding": "gzip"}}}
+    result = middleware(event, None)
+    assert b64decode(result["body"]) == b"\0" * 1000
+    assert "content-encoding" not in result["headers"]
+
+
+def test_weakens_etag():
+    @request_response
+    def app(request):
+        return PlainTextResponse(BODY, headers={"ETag": '"abc"'})
+
+    middleware = CompressionMiddleware(app)
+    event = {"http": {"method": "GET", "headers": {"accept-encoding": "gzip"}}}
+    result = middleware(event, None)
+    assert result["headers"]["etag"] == 'W/"abc"'
+
+
+def test_repeated_vary():
+    @request_response
+    def app(request):
+        response = PlainTextResponse(BODY)
+        response.add_header("Vary", "Cookie")
+        response.add_header("Vary", "Accept-Language")
+        return response
+
+    middleware = CompressionMiddleware(app)
+    event = {"http": {"method": "GET", "headers": {"accept-encoding": "gzip"}}}
+    result = middleware(event, None)
+    assert result["headers"]["vary"] == "Cookie, Accept-Language, Accept-Encoding"
@@ -0,0 +1,73 @@
+from seastar.middleware.conditional import ConditionalGetMiddleware
+from seastar.middleware.exceptions import ExceptionMiddleware
+from seastar.responses import JSONResponse, PlainTextResponse
+from seastar.routing import request_response
+
+
+@request_response
+def app(request):
+    return JSONResponse({"hello": "world"}, headers={"Cache-Control": "max-age=60"})
+
+
+def test_sets_etag():
+    middleware = ConditionalGetMiddleware(app)
+    event = {"http": {"method": "GET", "headers": {}}}
+    result = middleware(event, None)
+    assert result["statusCode"] == 200
+    assert result["headers"]["etag"].startswith('"')
+
+
+def test_if_none_match():
+    middleware = ConditionalGetMiddleware(app)
+    event = {"http": {"method": "GET", "headers": {}}}
+    etag = middleware(event, None)["headers"]["etag"]
+
+    event = {"http": {"method": "GET", "headers": {"if-none-match": f"W/{etag}"}}}
+    result = middleware(event, None)
+    assert result["statusCode"] == 304
+    assert "body" not in result
+    assert result["headers"]["etag"] == etag
+    assert result["headers"]["cache-control"] == "max-age=60"
+    assert "content-type" not in result["headers"]
+
+
+def test_if_none_match_changed():
+    middleware = ConditionalGetMiddleware(app)
+    event = {"http": {"method": "GET", "headers": {"if-none-match": '"abc"'}}}
+    result = middleware(event, None)
+    assert result["statusCode"] == 200
+
+
+def test_if_modified_since():
+    @request_response
+    def app(request):
+        headers = {"Last-Modified": "Sun, 01 Jan 2023 00:00:00 GMT"}
+        return PlainTextResponse("Hello, world!", headers=headers)
+
+    middleware = ConditionalGetMiddleware(app)
+    headers = {"if-modified-since": "Mon, 02 Jan 2023 00:00:00 GMT"}
+    event = {"http": {"method": "GET", "headers": headers}}
+    assert middleware(event, None)["statusCode"] == 304
+
+    headers = {"if-modified-since": "Sat, 31 Dec 2022 00:00:00 GMT"}
+    event = {"http": {"method": "GET", "headers": headers}}
+    assert middleware(event, None)["statusCode"] == 200
+
+
+def test_inside_exception_middleware():
+    middleware = ExceptionMiddleware(ConditionalGetMiddleware(app))
+    event = {"http": {"method": "GET", "headers": {}}}
+    etag = middleware(event, None)["headers"]["etag"]
+
+    event = {"http": {"method": "GET", "headers": {"if-none-match": etag}}}
+    result = middleware(event, None)
+    assert result["statusCode"] == 304
+    assert "body" not in result
+
+
+def test_post_is_ignored():
+    middleware = ConditionalGetMiddleware(app)
+    event = {"http": {"method": "POST", "headers": {"if-none-match": "*"}}}
+    result = middleware(event, None)
+    assert result["statusCode"] == 200
+    assert "etag" not in result["headers"]
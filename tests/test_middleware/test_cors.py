@@ -0,0 +1,104 @@
+from seastar import web_function
+from seastar.middleware import Middleware
+from seastar.middleware.cors import CORSMiddleware
+from seastar.responses import PlainTextResponse
+
+
+def make_event(method="GET", **headers):
+    return {"http": {"method": method, "path": "", "headers": headers}}
+
+
+def make_app(**options):
+    calls = []
+
+    middleware = [Middleware(CORSMiddleware, **options)]
+
+    @web_function(methods=["GET", "POST"], middleware=middleware)
+    def app(request):
+        calls.append(request)
+        return PlainTextResponse("Hello, world!")
+
+    return app, calls
+
+
+def test_preflight():
+    app, calls = make_app(
+        allow_origins=["https://example.org"],
+        allow_methods=["GET", "POST"],
+        allow_headers=["X-Token"],
+    )
+    event = make_event(
+        "OPTIONS",
+        **{
+            "origin": "https://example.org",
+            "access-control-request-method": "POST",
+            "access-control-request-headers": "x-token, content-type",
+        },
+    )
+    result = app(event, None)
+    assert result["statusCode"] == 200
+    assert result["headers"]["access-control-allow-origin"] == "https://example.org"
+    assert result["headers"]["access-control-allow-methods"] == "GET, POST"
+    assert result["headers"]["access-control-max-age"] == "600"
+    assert result["headers"]["vary"] == "Origin"
+    assert calls == []
+    assert "request" not in event["__seastar"]
+
+
+def test_disallowed_preflight():
+    app, calls = make_app(allow_origins=["https://example.org"])
+    event = make_event(
+        "OPTIONS",
+        **{
+            "origin": "https://evil.org",
+            "access-control-request-method": "DELETE",
+            "access-control-request-headers": "x-token",
+        },
+    )
+    result = app(event, None)
+    assert result["statusCode"] == 400
+    assert result["body"] == "Disallowed CORS origin, method, headers"
+    assert calls == []
+
+
+def test_simple_request():
+    app, _ = make_app(allow_origins=["*"], expose_headers=["X-Total"])
+    result = app(make_event(origin="https://example.org"), None)
+    assert result["body"] == "Hello, world!"
+    assert result["headers"]["access-control-allow-origin"] == "*"
+    assert result["headers"]["access-control-expose-headers"] == "X-Total"
+
+
+def test_origin_regex_with_credentials():
+    app, _ = make_app(
+        allow_origin_regex=r"https://.*\.example\.org", allow_credentials=True
+    )
+    result = app(make_event(origin="https://api.example.org"), None)
+    origin = result["headers"]["access-control-allow-origin"]
+    assert origin == "https://api.example.org"
+    assert result["headers"]["access-control-allow-credentials"] == "true"
+    assert result["headers"]["vary"] == "Origin"
+
+    result = app(make_event(origin="https://example.com"), None)
+    assert "access-control-allow-origin" not in result["headers"]
+
+
+def test_no_origin():
+    app, _ = make_app(allow_origins=["*"])
+    result = app(make_event(), None)
+    assert "access-control-allow-origin" not in result["headers"]
+
+
+def test_repeated_vary():
+    @web_function(
+        middleware=[Middleware(CORSMiddleware, allow_origins=["https://a.com"])]
+    )
+    def app(request):
+        response = PlainTextResponse("Hello, world!")
+        response.add_header("Vary", "Cookie")
+        response.add_header("Vary", "Accept-Language")
+        return response
+
+    result = app(make_event(origin="https://a.com"), None)
+    assert result["headers"]["vary"] == "Cookie, Accept-Language, Origin"
+    assert result["headers"]["access-control-allow-origin"] == "https://a.com"
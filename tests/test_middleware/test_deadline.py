@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+from starlette.exceptions import HTTPException
+import pytest
+
+from seastar import web_function
+from seastar.middleware import Middleware
+from seastar.middleware.deadline import DeadlineMiddleware
+from seastar.middleware.exceptions import ExceptionMiddleware
+from seastar.responses import PlainTextResponse
+from seastar.routing import request_response
+
+
+class Context:
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+@request_response
+def slow_app(request):
+    time.sleep(0.5)
+    return PlainTextResponse("Hello, world!")
+
+
+def test_within_budget():
+    @request_response
+    def app(request):
+        return PlainTextResponse(str(request.remaining_ms))
+
+    middleware = DeadlineMiddleware(app, margin_ms=500)
+    result = middleware({"http": {"method": "GET"}}, Context(10_000))
+    assert result["statusCode"] == 200
+    assert 9000 < int(result["body"]) <= 9500
+
+
+def test_budget_exceeded():
+    middleware = DeadlineMiddleware(slow_app, margin_ms=100)
+    result = middleware({"http": {"method": "GET"}}, Context(150))
+    assert result["statusCode"] == 503
+    assert result["headers"]["retry-after"] == "1"
+
+
+def test_budget_exceeded_not_entry_point():
+    middleware = ExceptionMiddleware(
+        DeadlineMiddleware(slow_app, margin_ms=100, status_code=504)
+    )
+    result = middleware({"http": {"method": "GET"}}, Context(150))
+    assert result["statusCode"] == 504
+    assert result["headers"]["retry-after"] == "1"
+
+
+def test_no_budget_left():
+    middleware = DeadlineMiddleware(slow_app, margin_ms=500)
+    result = middleware({"http": {"method": "GET"}}, Context(100))
+    assert result["statusCode"] == 503
+
+
+def test_workers_busy(caplog):
+    middleware = DeadlineMiddleware(slow_app, margin_ms=100, max_workers=1)
+    assert middleware({"http": {"method": "GET"}}, Context(150))["statusCode"] == 503
+
+    @request_response
+    def app(request):
+        return PlainTextResponse("Hello, world!")
+
+    middleware.app = app
+
+    start = time.perf_counter()
+    result = middleware({"http": {"method": "GET"}}, Context(1000))
+    assert result["statusCode"] == 200
+    assert time.perf_counter() - start < 0.1
+    assert "deadline workers are busy" in caplog.text
+
+
+def test_exception_propagates():
+    @request_response
+    def app(request):
+        raise HTTPException(404)
+
+    middleware = DeadlineMiddleware(app)
+    with pytest.raises(HTTPException):
+        middleware({"http": {"method": "GET"}}, Context(10_000))
+
+
+def test_no_context():
+    @request_response
+    def app(request):
+        return PlainTextResponse(repr(request.remaining_ms))
+
+    middleware = DeadlineMiddleware(app)
+    assert middleware({"http": {"method": "GET"}}, None)["body"] == "None"
+
+
+def test_async_app_uses_the_startup_loop():
+    async def startup(state):
+        state.loop = asyncio.get_running_loop()
+
+    @web_function(on_startup=[startup], middleware=[Middleware(DeadlineMiddleware)])
+    async def app(request):
+        same = asyncio.get_running_loop() is request.state.loop
+        return PlainTextResponse(str(same))
+
+    event = {"http": {"method": "GET", "path": "", "headers": {}}}
+    for _ in range(2):
+        assert app(dict(event), Context(10_000))["body"] == "True"
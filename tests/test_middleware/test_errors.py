@@ -0,0 +1,26 @@
+from seastar.middleware.errors import ServerErrorMiddleware
+from seastar.routing import request_response
+
+
+@request_response
+def app(request):
+    raise RuntimeError("Something went wrong")
+
+
+def test_debug_html():
+    middleware = ServerErrorMiddleware(app, debug=True)
+
+    event = {"http": {"method": "GET", "headers": {"accept": "text/html"}}}
+    response = middleware(event, None)
+    assert response["statusCode"] == 500
+    assert response["headers"]["content-type"] == "text/html; charset=utf-8"
+    assert "Something went wrong" in response["body"]
+
+
+def test_debug_plain_text():
+    middleware = ServerErrorMiddleware(app, debug=True)
+
+    event = {"http": {"method": "GET", "headers": {}}}
+    response = middleware(event, None)
+    assert response["statusCode"] == 500
+    assert "RuntimeError: Something went wrong" in response["body"]
@@ -61,3 +61,56 @@ def test_exception_not_handled():
 
     with pytest.raises(ValueError):
         middleware(event, None)
+
+
+def test_async_exception_handler():
+    @request_response
+    async def app(request):
+        raise HTTPException(404)
+
+    async def not_found_handler(request, exc):
+        return PlainTextResponse("Async Not Found", status_code=404)
+
+    middleware = ExceptionMiddleware(app, handlers={404: not_found_handler})
+
+    event = {"http": {"method": "GET"}}
+    response = middleware(event, None)
+    assert response["statusCode"] == 404
+    assert response["body"] == "Async Not Found"
+
+
+def test_handler_lookup_is_cached():
+    class NotFound(LookupError):
+        pass
+
+    @request_response
+    def app(request):
+        raise NotFound("missing")
+
+    def lookup_handler(request, exc):
+        return PlainTextResponse("lookup", status_code=404)
+
+    def not_found_handler(request, exc):
+        return PlainTextResponse("not found", status_code=404)
+
+    middleware = ExceptionMiddleware(app, handlers={LookupError: lookup_handler})
+
+    event = {"http": {"method": "GET"}}
+    assert middleware(dict(event), None)["body"] == "lookup"
+    assert middleware._handler_cache[NotFound] is lookup_handler
+
+    # adding a handler invalidates what was resolved before.
+    middleware.add_exception_handler(NotFound, not_found_handler)
+    assert middleware(dict(event), None)["body"] == "not found"
+
+
+def test_unhandled_exception_is_cached():
+    @request_response
+    def app(request):
+        raise ValueError()
+
+    middleware = ExceptionMiddleware(app)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            middleware({"http": {"method": "GET"}}, None)
+    assert middleware._handler_cache == {ValueError: None}
@@ -0,0 +1,69 @@
+from seastar.middleware.lifespan import LifespanMiddleware
+from seastar.responses import PlainTextResponse
+from seastar.routing import request_response
+
+
+def test_startup_runs_once():
+    calls = []
+
+    def startup(state):
+        calls.append(state)
+        state.client = "client"
+
+    @request_response
+    def app(request):
+        return PlainTextResponse(request.state.client)
+
+    middleware = LifespanMiddleware(app, on_startup=[startup])
+    assert middleware({"http": {"method": "GET"}}, None)["body"] == "client"
+    assert middleware({"http": {"method": "GET"}}, None)["body"] == "client"
+    assert len(calls) == 1
+    assert middleware.started
+    assert middleware.startup_duration is not None
+
+
+def test_failed_startup_is_retried():
+    calls = []
+
+    def startup(state):
+        calls.append(state)
+        if len(calls) == 1:
+            raise RuntimeError()
+
+    @request_response
+    def app(request):
+        return PlainTextResponse("Hello, world!")
+
+    middleware = LifespanMiddleware(app, on_startup=[startup])
+    try:
+        middleware({"http": {"method": "GET"}}, None)
+    except RuntimeError:
+        pass
+
+    assert middleware({"http": {"method": "GET"}}, None)["statusCode"] == 200
+    assert len(calls) == 2
+
+
+def test_shutdown():
+    closed = []
+
+    @request_response
+    def app(request):
+        return PlainTextResponse("Hello, world!")
+
+    middleware = LifespanMiddleware(app, on_shutdown=[lambda state: closed.append(1)])
+    middleware({"http": {"method": "GET"}}, None)
+    middleware.shutdown()
+    assert closed == [1]
+
+
+def test_async_startup():
+    async def startup(state):
+        state.client = "async client"
+
+    @request_response
+    async def app(request):
+        return PlainTextResponse(request.state.client)
+
+    middleware = LifespanMiddleware(app, on_startup=[startup])
+    assert middleware({"http": {"method": "GET"}}, None)["body"] == "async client"
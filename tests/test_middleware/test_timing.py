@@ -0,0 +1,52 @@
+import json
+import logging
+
+from seastar import web_function
+from seastar.middleware.timing import TimingMiddleware
+from seastar.responses import JSONResponse
+from seastar.timing import get_timings
+
+
+def parse_server_timing(value):
+    timings = {}
+    for item in value.split(", "):
+        name, _, duration = item.partition(";dur=")
+        timings[name] = float(duration)
+    return timings
+
+
+@web_function("/items/{item_id}")
+def handler(request):
+    with request.span("db"):
+        pass
+    return JSONResponse({"id": request.path_params["item_id"]})
+
+
+def test_server_timing_header():
+    middleware = TimingMiddleware(handler)
+    event = {"http": {"method": "GET", "path": "/items/1", "headers": {}}}
+    result = middleware(event, None)
+    assert result["statusCode"] == 200
+    timings = parse_server_timing(result["headers"]["server-timing"])
+    assert {"route", "handler", "db", "render", "response", "total"} <= set(timings)
+    assert timings["total"] >= timings["handler"] >= timings["render"]
+
+
+def test_log(caplog):
+    middleware = TimingMiddleware(handler, header=False, log=True)
+    event = {"http": {"method": "GET", "path": "/items/1", "headers": {}}}
+    with caplog.at_level(logging.INFO, logger="seastar"):
+        result = middleware(event, None)
+
+    assert "server-timing" not in result["headers"]
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["path"] == "/items/1"
+    assert record["status"] == 200
+    assert "handler" in record["timings"]
+
+
+def test_disabled():
+    event = {"http": {"method": "GET", "path": "/items/1", "headers": {}}}
+    result = handler(event, None)
+    assert "server-timing" not in result["headers"]
+    assert get_timings() is None
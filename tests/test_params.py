@@ -0,0 +1,155 @@
+from enum import Enum
+from typing import Optional
+
+import pytest
+
+from seastar import web_function
+from seastar.applications import Seastar
+from seastar.params import Body, Header, Query, compile_injector
+from seastar.requests import Request
+from seastar.responses import JSONResponse, PlainTextResponse
+from seastar.routing import Route
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+def make_event(path="/items/42", query="", headers=None, body=None):
+    http = {
+        "method": "GET",
+        "path": path,
+        "headers": headers or {},
+        "queryString": query,
+    }
+    if body is not None:
+        http["method"] = "POST"
+        http["body"] = body
+        http["headers"]["content-type"] = "application/json"
+    return {"http": http}
+
+
+def test_request_only_endpoints_are_not_injected():
+    def positional(req):
+        pass
+
+    def annotated(request: Request):
+        pass
+
+    assert compile_injector(positional) is None
+    assert compile_injector(annotated) is None
+
+
+def test_unresolved_request_annotation():
+    namespace = {"PlainTextResponse": PlainTextResponse}
+    exec(
+        "from __future__ import annotations\n"
+        "from typing import TYPE_CHECKING\n"
+        "if TYPE_CHECKING:\n"
+        "    from seastar.requests import Request\n"
+        "def named(request: Request):\n"
+        "    return PlainTextResponse(str(request.path_params['item_id']))\n"
+        "def renamed(req: Request):\n"
+        "    return PlainTextResponse(str(req.path_params['item_id']))\n",
+        namespace,
+    )
+    for name in ("named", "renamed"):
+        endpoint = namespace[name]
+        assert compile_injector(endpoint) is None
+
+        app = Seastar(Route("/items/{item_id:int}", endpoint))
+        assert app(make_event(), None)["body"] == "42"
+
+
+def test_path_query_and_header_params():
+    def endpoint(
+        item_id: int,
+        limit: int = 10,
+        tags: Optional[list[str]] = None,
+        color: Color = Color.RED,
+        verbose: bool = False,
+        user_agent: Optional[str] = Header(None),
+    ):
+        return JSONResponse(
+            [item_id, limit, tags, color.value, verbose, user_agent]
+        )
+
+    app = Seastar(Route("/items/{item_id}", endpoint))
+    event = make_event(
+        query="limit=5&tags=a&tags=b&color=blue&verbose=true",
+        headers={"user-agent": "test"},
+    )
+    result = app(event, None)
+    assert result["body"] == '[42,5,["a","b"],"blue",true,"test"]'
+
+    result = app(make_event(), None)
+    assert result["body"] == '[42,10,null,"red",false,null]'
+
+
+@pytest.mark.parametrize(
+    "query,detail",
+    [
+        ("", '{"detail":[{"loc":["query","q"],"msg":"field required"}]}'),
+        (
+            "q=x&page=one",
+            '{"detail":[{"loc":["query","page"],"msg":"expected int"}]}',
+        ),
+    ],
+)
+def test_invalid_params(query, detail):
+    def endpoint(q: str, page: int = 1):
+        return PlainTextResponse(q)
+
+    app = Seastar(Route("/items/{item_id}", endpoint))
+    result = app(make_event(query=query), None)
+    assert result["statusCode"] == 422
+    assert result["body"] == detail
+
+
+def test_body_params():
+    def endpoint(request: Request, payload: dict, name: str = Query("?", alias="n")):
+        assert request.method == "POST"
+        return JSONResponse([payload, name])
+
+    app = Seastar(Route("/items", endpoint, methods=["POST"]))
+    result = app(make_event("/items", query="n=x", body='{"a": 1}'), None)
+    assert result["body"] == '[{"a":1},"x"]'
+
+    result = app(make_event("/items", body=""), None)
+    assert result["statusCode"] == 422
+
+
+def test_optional_body():
+    def endpoint(data=Body(None)):
+        return JSONResponse(data)
+
+    app = Seastar(Route("/items", endpoint, methods=["POST"]))
+    assert app(make_event("/items", body=""), None)["body"] == "null"
+
+
+def test_non_raw_params():
+    @web_function()
+    def endpoint(
+        name: str = "x", page: int = 1, tags: list[str] = [], item: dict = Body()
+    ):
+        return JSONResponse([name, page, tags, item])
+
+    http = {"method": "GET", "path": "", "headers": {}}
+    event = {"http": http, "item": {"a": 1}}
+    assert endpoint(event, None)["body"] == '["x",1,[],{"a":1}]'
+
+    event = {"http": http, "item": {"a": 1}, "name": "bob", "page": 2, "tags": "a"}
+    assert endpoint(event, None)["body"] == '["bob",2,["a"],{"a":1}]'
+
+    result = endpoint({"http": http, "item": {}, "page": "one"}, None)
+    assert result["statusCode"] == 422
+    assert result["body"] == (
+        '{"detail":[{"loc":["query","page"],"msg":"expected int"}]}'
+    )
+
+    result = endpoint({"http": http}, None)
+    assert result["statusCode"] == 422
+    assert result["body"] == (
+        '{"detail":[{"loc":["body","item"],"msg":"field required"}]}'
+    )
@@ -1,3 +1,5 @@
+import time
+
 import pytest
 
 from starlette.exceptions import HTTPException
@@ -73,6 +75,42 @@ def test_body_base64():
     assert request.body == "body"
 
 
+def test_body_bytes():
+    event = {"http": {"body": "body"}}
+    request = Request(event)
+    assert request.body_bytes == b"body"
+
+
+def test_body_bytes_base64_binary():
+    event = {"http": {"body": "iVBORw0KGgo=", "isBase64Encoded": True}}
+    request = Request(event)
+    assert request.body_bytes == b"\x89PNG\r\n\x1a\n"
+
+
+def test_body_bytes_invalid_base64():
+    event = {"http": {"body": "Ym9ke", "isBase64Encoded": True}}
+    request = Request(event)
+    with pytest.raises(HTTPException) as exc_info:
+        request.body_bytes
+    assert exc_info.value.status_code == 400
+
+
+def test_body_too_large():
+    event = {"http": {"body": "Ym9keQ==", "isBase64Encoded": True}}
+    assert Request(event, max_body_size=4).body == "body"
+
+    request = Request(event, max_body_size=3)
+    with pytest.raises(HTTPException) as exc_info:
+        request.body
+    assert exc_info.value.status_code == 413
+
+    event = {"http": {"body": "body"}}
+    request = Request(event, max_body_size=3)
+    with pytest.raises(HTTPException) as exc_info:
+        request.body_bytes
+    assert exc_info.value.status_code == 413
+
+
 def test_body_not_raw_http():
     event = {"http": {"headers": {}}}
     request = Request(event)
@@ -97,6 +135,18 @@ def test_json_body():
     assert request.json() == {"key": "value"}
 
 
+def test_json_body_base64():
+    event = {
+        "http": {
+            "body": "eyJrZXkiOiAidmFsdWUifQ==",
+            "isBase64Encoded": True,
+            "headers": {"Content-Type": "application/json"},
+        }
+    }
+    request = Request(event)
+    assert request.json() == {"key": "value"}
+
+
 def test_json_unsupported_media_type():
     event = {"http": {"body": "body", "headers": {"Content-Type": "text/plain"}}}
     request = Request(event)
@@ -135,4 +185,64 @@ def test_form_body():
         }
     }
     request = Request(event)
-    assert dict(request.form()) == {"key1": "value1", "key2": "value2"}
\ No newline at end of file
+    assert dict(request.form()) == {"key1": "value1", "key2": "value2"}
+
+def test_state():
+    event = {"http": {}}
+    request = Request(event)
+    request.state.value = 1
+    assert Request(event).state.value == 1
+
+
+def test_run_parallel():
+    request = Request({"http": {}})
+    assert request.run_parallel(lambda: 1, lambda: 2) == [1, 2]
+    assert request.map(lambda x, y: x + y, [1, 2], [10, 20]) == [11, 22]
+
+
+def test_run_parallel_deadline():
+    event = {"http": {}, "__seastar": {"deadline": time.time() * 1000 + 10}}
+    request = Request(event)
+    with pytest.raises(HTTPException) as exc_info:
+        request.run_parallel(lambda: time.sleep(0.2))
+    assert exc_info.value.status_code == 503
+
+
+def test_request_has_no_dict():
+    request = Request({"http": {"headers": {}}})
+    assert not hasattr(request, "__dict__")
+    with pytest.raises(AttributeError):
+        request.foo = "bar"
+
+
+def test_headers_case_insensitive():
+    event = {"http": {"headers": {"content-type": "text/plain", "X-Custom": "1"}}}
+    request = Request(event)
+    assert request.headers["Content-Type"] == "text/plain"
+    assert request.headers["x-custom"] == "1"
+    assert "X-CUSTOM" in request.headers
+    assert request.headers.get("missing") is None
+    assert sorted(request.headers) == ["content-type", "x-custom"]
+    assert len(request.headers) == 2
+
+    event = {"http": {"headers": {"x-custom": "1", "X-Custom": "2"}}}
+    headers = Request(event).headers
+    assert len(headers) == len(list(headers)) == 1
+
+
+def test_query_params_decoding():
+    event = {"http": {"queryString": "a=1&b=x+y&a=2&c%20d=%2F&blank="}}
+    request = Request(event)
+    assert request.query_params["a"] == "2"
+    assert request.query_params.getlist("a") == ["1", "2"]
+    assert request.query_params["b"] == "x y"
+    assert request.query_params["c d"] == "/"
+    assert request.query_params["blank"] == ""
+    assert request.query_params.get("missing") is None
+    assert str(request.query_params) == event["http"]["queryString"]
+
+
+@pytest.mark.parametrize("key,values", [("a", ["1", ""]), ("aa", ["2"]), ("b", [])])
+def test_query_params_lookup(key, values):
+    request = Request({"http": {"queryString": "a=1&aa=2&ba=3&a"}})
+    assert request.query_params.getlist(key) == values
@@ -1,4 +1,12 @@
-from seastar.responses import HTMLResponse, JSONResponse, PlainTextResponse
+from base64 import b64decode
+
+from seastar.responses import (
+    BytesResponse,
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    PlainTextResponse,
+)
 
 
 def test_html_response():
@@ -22,3 +30,67 @@ def test_json_response():
     assert response.body == '{"message":"Hello, World!"}'
     assert response.headers["content-type"] == "application/json"
 
+
+
+def test_bytes_response():
+    response = BytesResponse(b"\x89PNG")
+    assert response.headers["content-type"] == "application/octet-stream"
+    result = response()
+    assert result["body"] == "iVBORw=="
+    assert result["isBase64Encoded"] is True
+
+
+def test_file_response(tmp_path):
+    path = tmp_path / "index.html"
+    path.write_bytes(b"<h1>Hello</h1>")
+
+    response = FileResponse(str(path))
+    result = response()
+    assert result["statusCode"] == 200
+    assert result["isBase64Encoded"] is True
+    assert b64decode(result["body"]) == b"<h1>Hello</h1>"
+    assert result["headers"]["content-type"] == "text/html; charset=utf-8"
+    assert result["headers"]["content-length"] == "14"
+    etag = result["headers"]["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    # the file is only read once.
+    path.write_bytes(b"changed")
+    assert FileResponse(str(path))()["body"] == result["body"]
+
+
+def test_response_headers_changed_after_init():
+    response = PlainTextResponse("Hello, world!", headers={"X-Custom": "1"})
+    assert response()["headers"] == {
+        "x-custom": "1",
+        "content-length": "13",
+        "content-type": "text/plain; charset=utf-8",
+    }
+
+    response.headers["x-other"] = "2"
+    response.set_cookie("session", "abc")
+    headers = response()["headers"]
+    assert headers["x-other"] == "2"
+    assert headers["set-cookie"].startswith("session=abc")
+
+
+def test_response_repeated_headers():
+    response = PlainTextResponse("Hello, world!")
+    response.set_cookie("session", "abc", httponly=True)
+    response.delete_cookie("theme")
+    headers = response()["headers"]
+    session, theme = headers["set-cookie"]
+    assert session == "session=abc; HttpOnly; Path=/; SameSite=lax"
+    assert theme.startswith('theme=""; expires=')
+    assert "Max-Age=0" in theme
+
+    headers["set-cookie"].append("other=1")
+    assert len(response.headers["set-cookie"]) == 2
+
+
+def test_response_content_length_is_in_bytes():
+    response = PlainTextResponse("naïve")
+    assert response.headers["content-length"] == "6"
+
+    response = JSONResponse(None, status_code=204)
+    assert "content-length" not in response.headers
@@ -1,8 +1,12 @@
+import asyncio
+
 import pytest
 
 from starlette.exceptions import HTTPException
 
-from seastar.routing import Route, Match
+from seastar import web_function
+from seastar.applications import Seastar
+from seastar.routing import Match, Route, Router
 from seastar.exceptions import WebEventException
 from seastar.requests import Request
 from seastar.responses import PlainTextResponse
@@ -116,3 +120,185 @@ def test_route_handle_raise_method_not_allowed():
         assert exc.headers["Allow"] == "POST"
     else:
         assert False, "Expected HTTPException to be raised"
+
+
+def test_router_static_route():
+    router = Router()
+
+    @router.route("/hello")
+    def hello(request: Request):
+        return PlainTextResponse("Hello, world!")
+
+    event = {"http": {"method": "GET", "path": "/hello"}}
+    result = router(event, None)
+    assert result["statusCode"] == 200
+    assert result["body"] == "Hello, world!"
+
+
+def test_router_path_params():
+    router = Router()
+
+    @router.route("/users/{user_id:int}")
+    def get_user(request: Request):
+        return PlainTextResponse(repr(request.path_params["user_id"]))
+
+    @router.route("/files/{path:path}")
+    def get_file(request: Request):
+        return PlainTextResponse(request.path_params["path"])
+
+    event = {"http": {"method": "GET", "path": "/users/42"}}
+    assert router(event, None)["body"] == "42"
+
+    event = {"http": {"method": "GET", "path": "/files/a/b.txt"}}
+    assert router(event, None)["body"] == "a/b.txt"
+
+
+def test_router_method_dispatch():
+    router = Router()
+
+    @router.route("/items/{item_id}")
+    def get_item(request: Request):
+        return PlainTextResponse("get")
+
+    @router.route("/items/{item_id}", methods=["DELETE"])
+    def delete_item(request: Request):
+        return PlainTextResponse("delete")
+
+    event = {"http": {"method": "DELETE", "path": "/items/1"}}
+    assert router(event, None)["body"] == "delete"
+
+    event = {"http": {"method": "GET", "path": "/items/1"}}
+    assert router(event, None)["body"] == "get"
+
+
+def test_router_fallback_to_later_pattern():
+    router = Router()
+
+    @router.route("/{name}")
+    def by_name(request: Request):
+        return PlainTextResponse("name")
+
+    @router.route("/{number:int}", methods=["POST"])
+    def by_number(request: Request):
+        return PlainTextResponse(repr(request.path_params["number"]))
+
+    event = {"http": {"method": "POST", "path": "/7"}}
+    assert router(event, None)["body"] == "7"
+
+
+def test_router_not_found():
+    router = Router()
+    router.add_route("/", lambda request: PlainTextResponse("Hello, world!"))
+
+    event = {"http": {"method": "GET", "path": "/not-found"}}
+    result = router(event, None)
+    assert result["statusCode"] == 404
+    assert result["body"] == "Not Found"
+
+
+def test_router_method_not_allowed():
+    router = Router()
+    router.add_route("/", lambda request: None, methods=["POST"])
+    router.add_route("/", lambda request: None, methods=["PUT"])
+
+    event = {"http": {"method": "GET", "path": "/"}}
+    result = router(event, None)
+    assert result["statusCode"] == 405
+    assert result["body"] == "Method Not Allowed"
+    assert result["headers"]["allow"] == "POST, PUT"
+
+
+def test_router_raise_method_not_allowed():
+    router = Router()
+    router.add_route("/{name}", lambda request: None, methods=["POST"])
+
+    event = {
+        "http": {"method": "GET", "path": "/james"},
+        "__seastar": {"entry_point": None},
+    }
+    with pytest.raises(HTTPException) as exc_info:
+        router(event, None)
+
+    assert exc_info.value.status_code == 405
+    assert exc_info.value.headers["Allow"] == "POST"
+
+
+def test_route_async_endpoint():
+    async def handler(request: Request):
+        start = asyncio.get_running_loop().time()
+        await asyncio.gather(asyncio.sleep(0.05), asyncio.sleep(0.05))
+        elapsed = asyncio.get_running_loop().time() - start
+        return PlainTextResponse(str(elapsed < 0.09))
+
+    route = Route("/", handler)
+    event = {"http": {"method": "GET", "path": "/"}}
+    result = route(event, None)
+    assert result["statusCode"] == 200
+    assert result["body"] == "True"
+
+
+def test_router_head():
+    router = Router()
+    router.add_route("/", lambda request: PlainTextResponse("Hello, world!"))
+    router.add_route("/", lambda request: None, methods=["PUT"])
+
+    event = {"http": {"method": "HEAD", "path": "/"}}
+    result = router(event, None)
+    assert result["statusCode"] == 200
+    assert "body" not in result
+    assert result["headers"]["content-length"] == "13"
+
+    event = {"http": {"method": "DELETE", "path": "/"}}
+    assert router(event, None)["headers"]["allow"] == "GET, HEAD, PUT"
+
+
+def test_error_results_are_copies():
+    route = Route("/", lambda request: None, methods=["POST"])
+
+    result = route({"http": {"method": "GET", "path": "/"}}, None)
+    result["headers"]["allow"] = "changed"
+    result = route({"http": {"method": "GET", "path": "/"}}, None)
+    assert result["headers"]["allow"] == "POST"
+
+    result = route({"http": {"method": "GET", "path": "/missing"}}, None)
+    result["headers"].clear()
+    result = route({"http": {"method": "GET", "path": "/missing"}}, None)
+    assert result["statusCode"] == 404
+    assert result["headers"]["content-length"] == "9"
+
+
+def test_method_not_allowed_under_seastar(monkeypatch):
+    @web_function("/", methods=["POST"])
+    def handler(request):
+        return PlainTextResponse("Hello, world!")
+
+    router = Router()
+    router.add_route("/", lambda request: None, methods=["POST"])
+    app = Seastar(router)
+
+    def get(function):
+        event = {"http": {"method": "GET", "path": "/", "headers": {}}}
+        return function(event, None)
+
+    # the router builds the result for a set of methods on first use.
+    get(app)
+
+    created = []
+    init = PlainTextResponse.__init__
+
+    def counting_init(self, *args, **kwargs):
+        created.append(self)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(PlainTextResponse, "__init__", counting_init)
+    for function in (handler, app):
+        result = get(function)
+        assert result["statusCode"] == 405
+        assert result["headers"]["allow"] == "POST"
+    assert created == []
+
+    @handler.exception_handler(405)
+    def method_not_allowed(request, exc):
+        return PlainTextResponse("Nope", status_code=405)
+
+    assert get(handler)["body"] == "Nope"
@@ -28,3 +28,43 @@ def test_webfunction_with_errorhandlers():
     result = event_handler(event, None)
     assert result["body"] == "shit!"
 
+
+
+def test_webfunction_max_body_size():
+
+    @web_function(methods=["POST"], max_body_size=4)
+    def handler(request):
+        return PlainTextResponse(request.body)
+
+    event = {"http": {"path": "", "method": "POST", "headers": {}, "body": "12345"}}
+    result = handler(event, None)
+    assert result["statusCode"] == 413
+
+
+def test_webfunction_on_startup():
+
+    def startup(state):
+        state.greeting = "Hello World!"
+
+    @web_function(on_startup=[startup])
+    def handler(request):
+        return PlainTextResponse(request.state.greeting)
+
+    event = {"http": {"path": "", "method": "GET", "headers": {}}}
+    assert handler(event, None)["body"] == "Hello World!"
+
+
+def test_webfunction_head():
+    calls = []
+
+    @web_function()
+    def handler(request):
+        calls.append(request.method)
+        return PlainTextResponse("Hello World!")
+
+    event = {"http": {"path": "", "method": "HEAD", "headers": {}}}
+    result = handler(event, None)
+    assert result["statusCode"] == 200
+    assert "body" not in result
+    assert result["headers"]["content-length"] == "12"
+    assert calls == ["HEAD"]
@@ -0,0 +1,143 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Literal, Optional, TypedDict, Union
+
+import pytest
+
+from seastar import web_function
+from seastar.params import Body
+from seastar.responses import JSONResponse
+from seastar.validation import ValidationError, compile_schema
+
+
+class Size(Enum):
+    SMALL = "s"
+    LARGE = "l"
+
+
+@dataclass
+class Item:
+    name: str
+    price: float
+    size: Size = Size.SMALL
+    tags: list[str] = field(default_factory=list)
+
+
+class Order(TypedDict):
+    id: int
+    items: list[Item]
+    note: Optional[str]
+    kind: Literal["online", "store"]
+
+
+def errors(schema, value):
+    with pytest.raises(ValidationError) as info:
+        compile_schema(schema, "body")(value)
+    return info.value.errors
+
+
+def test_valid_order():
+    validate = compile_schema(Order, "body")
+    order = validate(
+        {
+            "id": 1,
+            "items": [{"name": "a", "price": 1, "size": "l"}],
+            "note": None,
+            "kind": "store",
+        }
+    )
+    assert order["items"] == [Item("a", 1.0, Size.LARGE)]
+
+
+def test_error_paths():
+    value = {
+        "id": True,
+        "items": [{"name": "a", "price": 1}, {"name": 2, "size": "m"}],
+        "kind": "mail",
+    }
+    assert errors(Order, value) == [
+        {"loc": ["body", "id"], "msg": "expected an integer"},
+        {"loc": ["body", "items", 1, "name"], "msg": "expected a string"},
+        {"loc": ["body", "items", 1, "price"], "msg": "field required"},
+        {"loc": ["body", "items", 1, "size"], "msg": "expected one of 's', 'l'"},
+        {"loc": ["body", "note"], "msg": "field required"},
+        {"loc": ["body", "kind"], "msg": "expected one of 'online', 'store'"},
+    ]
+
+
+@pytest.mark.parametrize(
+    "schema,value,expected",
+    [
+        (list[int], [1, 2], [1, 2]),
+        (dict[str, float], {"a": 1}, {"a": 1.0}),
+        (Union[int, str], "a", "a"),
+        (tuple[int, ...], [1, 2], (1, 2)),
+    ],
+)
+def test_generics(schema, value, expected):
+    assert compile_schema(schema, "body")(value) == expected
+
+
+def test_unsupported_type():
+    with pytest.raises(TypeError):
+        compile_schema(bytes, "body")
+
+
+def test_web_function_body_schema():
+    @web_function(methods=["POST"], body_schema=Item)
+    def handler(request):
+        return JSONResponse(request.json().name)
+
+    event = {
+        "http": {
+            "method": "POST",
+            "path": "",
+            "headers": {"content-type": "application/json"},
+            "body": '{"name": "a", "price": "free"}',
+        }
+    }
+    result = handler(event, None)
+    assert result["statusCode"] == 422
+    assert result["body"] == (
+        '{"detail":[{"loc":["body","price"],"msg":"expected a number"}]}'
+    )
+
+    event = {"http": {**event["http"], "body": '{"name": "a", "price": 1}'}}
+    assert handler(event, None)["body"] == '"a"'
+
+
+def test_web_function_parameters_schema():
+    @dataclass
+    class Greeting:
+        name: str
+        times: int = 1
+
+    @web_function(parameters_schema=Greeting)
+    def handler(request):
+        greeting = request.parameters
+        return JSONResponse(greeting.name * greeting.times)
+
+    event = {"http": {"method": "GET", "path": "", "headers": {}}, "name": "a"}
+    assert handler(dict(event, times=2), None)["body"] == '"aa"'
+
+    result = handler(dict(event, times="2"), None)
+    assert result["statusCode"] == 422
+    assert '"loc":["parameters","times"]' in result["body"]
+
+
+def test_injected_body_is_validated():
+    @web_function(methods=["POST"])
+    def handler(items: list[Item] = Body()):
+        return JSONResponse([item.price for item in items])
+
+    event = {
+        "http": {
+            "method": "POST",
+            "path": "",
+            "headers": {"content-type": "application/json"},
+            "body": '[{"name": "a", "price": 1}, {"name": "b"}]',
+        }
+    }
+    result = handler(event, None)
+    assert result["statusCode"] == 422
+    assert '"loc":["body",1,"price"]' in result["body"]